@@ -1,28 +1,14 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+"""Paquete de la API.
 
-from app.api.api_v1 import api_router
-from app.core.config import settings
+La aplicación se construye en ``app.main``; aquí solo se expone de forma diferida
+para que importar cualquier submódulo (p. ej. desde los procesos del pool de
+exportación) no cree la aplicación completa.
+"""
 
 
-def create_application() -> FastAPI:
-    application = FastAPI(title=settings.app_name, version="1.0.0")
+def __getattr__(name: str):
+    if name in {"app", "create_application"}:
+        from app import main
 
-    application.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.cors_origins_list,
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-    @application.get("/")
-    async def root():
-        return {"message": "API Design Tools", "version": "1.0.0"}
-
-    application.include_router(api_router, prefix=settings.api_v1_prefix)
-
-    return application
-
-
-app = create_application()
+        return getattr(main, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
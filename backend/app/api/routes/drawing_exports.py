@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import cast
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
@@ -20,7 +20,6 @@ router = APIRouter(prefix="/drawing/exports", tags=["drawing-exports"])
 def enqueue_drawing_export(
     *,
     export_in: DrawingExportJobCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(deps.get_db_session),
     current_user: models.User = Depends(deps.get_current_user),
 ):
@@ -45,7 +44,7 @@ def enqueue_drawing_export(
         request=request,
         user_id=user_id,
     )
-    background_tasks.add_task(drawing_export_service.process_export_job, str(job.job_id))
+    drawing_export_service.submit_export_job(db, job)
     return drawing_export_service.serialize_export_job(job)
 
 
@@ -212,3 +212,6 @@ class DesignExport(Base):
 
     design = relationship("Design", back_populates="exports")
     user = relationship("User", backref="design_exports")
+
+    # Las marcas de tiempo del servidor vuelven con el INSERT/UPDATE (RETURNING), sin refresh aparte
+    __mapper_args__ = {"eager_defaults": True}
@@ -5,6 +5,18 @@ import io
 from typing import Tuple
 
 _SVGWRITE = None
+_COORD_DECIMALS = 2
+_LAYER_PALETTE = {
+    "C-VIGA": "#222222",
+    "C-VIGA-HATCH": "#999999",
+    "C-APOYO": "#555555",
+    "C-EJES": "#1f77b4",
+    "A-REB-MAIN": "#d62728",
+    "A-REB-EST": "#ff7f0e",
+    "C-COTAS": "#9467bd",
+    "C-TEXT": "#111111",
+    "A-CART": "#222222",
+}
 
 from app.modules.drawing.domain import (
     DimensionEntity,
@@ -29,14 +41,16 @@ def _ensure_svgwrite():
 
 def render_svg(document: DrawingDocument) -> str:
     svgwrite = _ensure_svgwrite()
-    width = max((point[0] for entity in document.entities for point in _points(entity)), default=1000) + 100
-    height = max((point[1] for entity in document.entities for point in _points(entity)), default=400) + 100
+    # Extensión del dibujo en una sola pasada sobre los puntos
+    points = [point for entity in document.entities for point in _points(entity)]
+    width = max((point[0] for point in points), default=1000) + 100
+    height = max((point[1] for point in points), default=400) + 100
     svg = svgwrite.Drawing(size=(f"{width}px", f"{height}px"))
     for entity in document.entities:
         if isinstance(entity, PolylineEntity):
             svg.add(
                 svgwrite.shapes.Polyline(
-                    points=list(entity.points),
+                    points=_rounded(entity.points),
                     fill="none",
                     stroke=_layer_color(entity.layer),
                     stroke_width=_lineweight(entity.lineweight),
@@ -45,8 +59,8 @@ def render_svg(document: DrawingDocument) -> str:
         elif isinstance(entity, LineEntity):
             svg.add(
                 svgwrite.shapes.Line(
-                    start=entity.start,
-                    end=entity.end,
+                    start=_rounded_point(entity.start),
+                    end=_rounded_point(entity.end),
                     stroke=_layer_color(entity.layer),
                     stroke_width=_lineweight(entity.lineweight),
                 )
@@ -70,7 +84,7 @@ def render_svg(document: DrawingDocument) -> str:
             svg.add(
                 svgwrite.text.Text(
                     entity.content,
-                    insert=insert_point,
+                    insert=_rounded_point(insert_point),
                     fill=_layer_color(entity.layer),
                     font_size=f"{entity.height}px",
                     **text_kwargs,
@@ -79,7 +93,7 @@ def render_svg(document: DrawingDocument) -> str:
         elif isinstance(entity, HatchEntity):
             svg.add(
                 svgwrite.shapes.Polygon(
-                    points=list(entity.boundary),
+                    points=_rounded(entity.boundary),
                     fill="#dddddd",
                     stroke="none",
                 )
@@ -87,8 +101,8 @@ def render_svg(document: DrawingDocument) -> str:
         elif isinstance(entity, DimensionEntity):
             svg.add(
                 svgwrite.shapes.Line(
-                    start=entity.start,
-                    end=entity.end,
+                    start=_rounded_point(entity.start),
+                    end=_rounded_point(entity.end),
                     stroke="#888",
                     stroke_width=1,
                 )
@@ -97,7 +111,7 @@ def render_svg(document: DrawingDocument) -> str:
                 svg.add(
                     svgwrite.text.Text(
                         entity.text_override,
-                        insert=((entity.start[0] + entity.end[0]) / 2, entity.start[1] - 5),
+                        insert=_rounded_point(((entity.start[0] + entity.end[0]) / 2, entity.start[1] - 5)),
                         fill="#555",
                         font_size="10px",
                     )
@@ -108,18 +122,18 @@ def render_svg(document: DrawingDocument) -> str:
 
 
 def _layer_color(layer: str) -> str:
-    palette = {
-        "C-VIGA": "#222222",
-        "C-VIGA-HATCH": "#999999",
-        "C-APOYO": "#555555",
-        "C-EJES": "#1f77b4",
-        "A-REB-MAIN": "#d62728",
-        "A-REB-EST": "#ff7f0e",
-        "C-COTAS": "#9467bd",
-        "C-TEXT": "#111111",
-        "A-CART": "#222222",
-    }
-    return palette.get(layer, "#333333")
+    return _LAYER_PALETTE.get(layer, "#333333")
+
+
+def _rounded_point(point):
+    # Centésimas de px bastan para la vista previa y acortan el SVG
+    if point is None:
+        return point
+    return (round(point[0], _COORD_DECIMALS), round(point[1], _COORD_DECIMALS))
+
+
+def _rounded(points) -> list:
+    return [_rounded_point(point) for point in points]
 
 
 def _lineweight(value: float | None) -> float:
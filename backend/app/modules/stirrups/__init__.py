@@ -4,7 +4,9 @@ from .utils import (
     DEFAULT_STIRRUP_DIAMETER,
     DEFAULT_STIRRUP_HOOK_TYPE,
     calculate_effective_depth,
+    calculate_effective_depths,
     calculate_spacing_for_zone,
+    calculate_spacings_for_zone,
     get_default_stirrup_spec,
     derive_confined_segments,
     derive_unconfined_segments,
@@ -15,7 +17,9 @@ __all__ = [
     "DEFAULT_STIRRUP_DIAMETER",
     "DEFAULT_STIRRUP_HOOK_TYPE",
     "calculate_effective_depth",
+    "calculate_effective_depths",
     "calculate_spacing_for_zone",
+    "calculate_spacings_for_zone",
     "get_default_stirrup_spec",
     "derive_confined_segments",
     "derive_unconfined_segments",
@@ -5,6 +5,8 @@ from __future__ import annotations
 from collections.abc import Iterable
 from typing import List, Literal, Sequence, Tuple
 
+import numpy as np
+
 from app.schemas.tools.despiece import ProhibitedZone, RebarDetail
 
 DEFAULT_STIRRUP_DIAMETER = "#3"
@@ -28,6 +30,20 @@ def calculate_spacing_for_zone(effective_depth_m: float, zone: ZoneType) -> floa
     return max(0.0, effective_depth_m * factor)
 
 
+def calculate_effective_depths(section_heights_cm: np.ndarray, cover_cm: float) -> np.ndarray:
+    """Versión por arreglo de ``calculate_effective_depth`` para varias secciones."""
+    heights_cm = np.maximum(section_heights_cm, 0.0)
+    cover_value_cm = max(cover_cm or 0.0, 0.0)
+    effective_depths_cm = np.maximum(heights_cm - cover_value_cm - _INNER_CLEARANCE_CM, 0.0)
+    return effective_depths_cm / 100.0
+
+
+def calculate_spacings_for_zone(effective_depths_m: np.ndarray, zone: ZoneType) -> np.ndarray:
+    """Versión por arreglo de ``calculate_spacing_for_zone``."""
+    factor = 0.25 if zone == "confined" else 0.5
+    return np.maximum(0.0, effective_depths_m * factor)
+
+
 def get_default_stirrup_spec(section_height_cm: float, cover_cm: float) -> dict:
     effective_depth_m = calculate_effective_depth(section_height_cm, cover_cm)
     return {
@@ -118,7 +134,9 @@ __all__ = [
     "DEFAULT_STIRRUP_DIAMETER",
     "DEFAULT_STIRRUP_HOOK_TYPE",
     "calculate_effective_depth",
+    "calculate_effective_depths",
     "calculate_spacing_for_zone",
+    "calculate_spacings_for_zone",
     "get_default_stirrup_spec",
     "derive_confined_segments",
     "derive_unconfined_segments",
@@ -1,3 +1,4 @@
+from enum import StrEnum
 from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, validator
@@ -9,6 +10,14 @@ class BeamDetailPayload(DespieceVigaCreate):
     pass
 
 
+class HookType(StrEnum):
+    """Tipos de gancho admitidos; se serializan como '90', '135' o '180'."""
+
+    H90 = "90"
+    H135 = "135"
+    H180 = "180"
+
+
 class RebarDetail(BaseModel):
     """Detalle individual de una barra de refuerzo"""
 
@@ -21,7 +30,7 @@ class RebarDetail(BaseModel):
     end_m: float = Field(..., description="Coordenada de fin en metros")
     quantity: int = Field(1, description="Cantidad de barras idénticas")
     splices: Optional[List[Dict[str, Any]]] = Field(None, description="Detalles de empalmes")
-    hook_type: str = Field("135", description="Tipo de gancho: '90', '135', '180'")
+    hook_type: HookType = Field(HookType.H135, description="Tipo de gancho: '90', '135', '180'")
     development_length_m: Optional[float] = Field(None, description="Longitud de desarrollo requerida")
     start_hook_m: float = Field(0.0, ge=0.0, description="Longitud del gancho al inicio (m)")
     end_hook_m: float = Field(0.0, ge=0.0, description="Longitud del gancho al final (m)")
@@ -40,12 +49,6 @@ class RebarDetail(BaseModel):
             raise ValueError(f'Tipo debe ser uno de: {", ".join(valid_types)}')
         return value
 
-    @validator("hook_type")
-    def validate_hook_type(cls, value: str) -> str:
-        if value not in ["90", "135", "180"]:
-            raise ValueError('Hook type debe ser "90", "135" o "180"')
-        return value
-
     class Config:
         from_attributes = True
 
@@ -0,0 +1,57 @@
+"""Vista en arreglos paralelos de las barras de una viga para los recorridos agregados."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.tools.despiece import RebarDetail
+
+
+@dataclass(frozen=True, slots=True)
+class RebarBatch:
+    """Barras superiores seguidas de las inferiores, con sus atributos escalares en arreglos.
+
+    Los ``RebarDetail`` siguen siendo la frontera pública; el lote se arma una vez
+    que las barras están definitivas y lo comparten la lista de materiales y las
+    validaciones.
+    """
+
+    bars: Tuple[RebarDetail, ...]
+    top_count: int
+    diameters: List[str]
+    lengths: np.ndarray
+    quantities: np.ndarray
+    development: np.ndarray
+    continuous: np.ndarray
+
+    @classmethod
+    def from_bars(
+        cls, top_bars: Sequence[RebarDetail], bottom_bars: Sequence[RebarDetail]
+    ) -> "RebarBatch":
+        bars = (*top_bars, *bottom_bars)
+        count = len(bars)
+        return cls(
+            bars=bars,
+            top_count=len(top_bars),
+            diameters=[bar.diameter for bar in bars],
+            lengths=np.fromiter((bar.length_m for bar in bars), np.float64, count),
+            quantities=np.fromiter((bar.quantity for bar in bars), np.int64, count),
+            development=np.fromiter(
+                (bar.development_length_m or 0.0 for bar in bars), np.float64, count
+            ),
+            continuous=np.fromiter((bar.type == "continuous" for bar in bars), np.bool_, count),
+        )
+
+    @property
+    def top_bars(self) -> Tuple[RebarDetail, ...]:
+        return self.bars[: self.top_count]
+
+    @property
+    def bottom_bars(self) -> Tuple[RebarDetail, ...]:
+        return self.bars[self.top_count :]
+
+
+__all__ = ["RebarBatch"]
@@ -0,0 +1,157 @@
+"""Núcleos numéricos vectorizados del despiece."""
+
+from __future__ import annotations
+
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.tools.despiece import ProhibitedZone
+
+
+def intervals_overlap(
+    start: np.ndarray, end: np.ndarray, other_start: np.ndarray, other_end: np.ndarray
+) -> np.ndarray:
+    """Intersección abierta elemento a elemento: ``max(inicios) < min(fines)``."""
+    return np.maximum(start, other_start) < np.minimum(end, other_end)
+
+
+def zone_bounds(zones: Sequence[ProhibitedZone]) -> Tuple[np.ndarray, np.ndarray]:
+    """Convierte las zonas prohibidas a dos arreglos float64 (inicios, fines)."""
+    count = len(zones)
+    starts = np.fromiter((zone.start_m for zone in zones), np.float64, count)
+    ends = np.fromiter((zone.end_m for zone in zones), np.float64, count)
+    return starts, ends
+
+
+def splice_conflicts(
+    centers: np.ndarray,
+    splice_length: float,
+    zone_starts: np.ndarray,
+    zone_ends: np.ndarray,
+) -> np.ndarray:
+    """Máscara de centros cuyo empalme toca alguna zona prohibida."""
+    if zone_starts.size == 0:
+        return np.zeros(centers.shape, dtype=bool)
+    column = centers[:, None]
+    half_splice = splice_length / 2
+    inside = (zone_starts <= column) & (column <= zone_ends)
+    overlap = intervals_overlap(column - half_splice, column + half_splice, zone_starts, zone_ends)
+    return (inside | overlap).any(axis=1)
+
+
+def splice_positions(
+    total_length: float,
+    max_bar_length: float,
+    splice_length: float,
+    zone_starts: np.ndarray,
+    zone_ends: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Empalmes equiespaciados cuyo centro queda fuera de las zonas prohibidas."""
+    num_pieces = math.ceil(total_length / max_bar_length)
+    piece_length = total_length / num_pieces
+    half_splice = splice_length / 2
+    centers = np.arange(1, num_pieces, dtype=np.float64) * piece_length
+    column = centers[:, None]
+    blocked = ((zone_starts <= column) & (column <= zone_ends)).any(axis=1)
+    starts = np.maximum(0.0, centers - half_splice)
+    ends = np.minimum(total_length, centers + half_splice)
+    keep = ~blocked & (ends - starts >= splice_length * 0.8)
+    return starts[keep], ends[keep]
+
+
+def safe_splice_center(
+    start_range: float,
+    end_range: float,
+    splice_length: float,
+    step: float,
+    zone_starts: np.ndarray,
+    zone_ends: np.ndarray,
+) -> float:
+    """Primer centro libre de la malla (con puntos medios) en orden creciente; NaN si no hay."""
+    tolerance = 1e-3
+    stride = max(step, tolerance)
+    limit = end_range + tolerance
+    if not start_range <= limit:
+        return math.nan
+
+    # cumsum acumula en orden, como avanzar ``position += stride`` paso a paso
+    count = int((limit - start_range) / stride) + 3
+    grid = np.cumsum(np.concatenate(([start_range], np.full(count, stride))))
+    grid = grid[grid <= limit]
+    candidates = np.empty(2 * grid.size - 1, dtype=np.float64)
+    candidates[0::2] = grid
+    candidates[1::2] = (grid[:-1] + grid[1:]) / 2
+
+    half_splice = splice_length / 2
+    column = candidates[:, None]
+    blocked = intervals_overlap(column - half_splice, column + half_splice, zone_starts, zone_ends).any(axis=1)
+    free = np.flatnonzero(~blocked)
+    return float(candidates[free[0]]) if free.size else math.nan
+
+
+def offset_candidates(
+    original_center: float, offsets: Sequence[float], max_attempts: int
+) -> np.ndarray:
+    """Centros a probar: por intento, cada desplazamiento hacia adelante y luego hacia atrás."""
+    signed = np.array([direction * magnitude for magnitude in offsets for direction in (1, -1)], dtype=np.float64)
+    multipliers = np.arange(1, max_attempts + 1, dtype=np.float64)
+    return original_center + (multipliers[:, None] * signed).ravel()
+
+
+def first_valid_center(
+    candidates: np.ndarray,
+    zone_starts: np.ndarray,
+    zone_ends: np.ndarray,
+    existing_centers: np.ndarray,
+    existing_lengths: np.ndarray,
+    splice_length: float,
+    beam_length: float,
+) -> int:
+    """Primer candidato dentro de la viga, fuera de zonas y lejos de empalmes existentes; -1 si no hay."""
+    half_splice = splice_length / 2
+    valid = (candidates >= half_splice) & (candidates <= beam_length - half_splice)
+    valid &= ~splice_conflicts(candidates, splice_length, zone_starts, zone_ends)
+    if existing_centers.size:
+        distance = np.abs(candidates[:, None] - existing_centers)
+        valid &= ~(distance < np.maximum(splice_length, existing_lengths) * 1.2).any(axis=1)
+    hits = np.flatnonzero(valid)
+    return int(hits[0]) if hits.size else -1
+
+
+def segment_span_overlaps(
+    segment_starts: np.ndarray,
+    segment_ends: np.ndarray,
+    span_starts: np.ndarray,
+    span_ends: np.ndarray,
+    spacings: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pares (segmento, luz) con intersección positiva y estribos estimados en cada una.
+
+    El conteo es -1 cuando la separación de la luz no es positiva.
+    """
+    overlap_starts = np.maximum(segment_starts[:, None], span_starts)
+    overlap_ends = np.minimum(segment_ends[:, None], span_ends)
+    segment_idx, span_idx = np.nonzero(overlap_ends - overlap_starts > 0)
+    starts = overlap_starts[segment_idx, span_idx]
+    ends = overlap_ends[segment_idx, span_idx]
+    spacing = spacings[span_idx]
+    positive = spacing > 0
+    counts = np.full(segment_idx.size, -1, dtype=np.int64)
+    counts[positive] = np.maximum(
+        1, np.floor((ends - starts)[positive] / spacing[positive]).astype(np.int64) + 1
+    )
+    return segment_idx, span_idx, starts, ends, counts
+
+
+__all__ = [
+    "first_valid_center",
+    "intervals_overlap",
+    "offset_candidates",
+    "safe_splice_center",
+    "segment_span_overlaps",
+    "splice_conflicts",
+    "splice_positions",
+    "zone_bounds",
+]
@@ -1,13 +1,130 @@
 from __future__ import annotations
 
+import logging
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING, cast
 
-from app.schemas.tools.despiece import ProhibitedZone, RebarDetail
+import numpy as np
+
+from app.schemas.tools.despiece import RebarDetail
+from app.services.detailing.kernels import (
+    first_valid_center,
+    offset_candidates,
+    safe_splice_center,
+)
 from app.services.detailing.logger import detailing_logger as logger
+from app.services.detailing.zones import ZoneIndex
 
 if TYPE_CHECKING:
     from app.services.detailing_service import BeamDetailingService
 
+# Cómo se resolvió el fin de un segmento inferior (ver _resolve_bottom_segment_end)
+SEGMENT_END_DEFAULT = 0
+SEGMENT_END_CORRIDOR = 1
+SEGMENT_END_SAFE_CENTER = 2
+SEGMENT_END_NO_SAFE_CENTER = 3
+
+
+@dataclass(slots=True)
+class _SpliceCenters:
+    """Centros de empalmes ya ubicados, ordenados para buscar solo los vecinos cercanos."""
+
+    centers: List[float] = field(default_factory=list)
+    lengths: List[float] = field(default_factory=list)
+    longest: float = 0.0
+
+    def add(self, center: float, length: float) -> None:
+        idx = bisect_right(self.centers, center)
+        self.centers.insert(idx, center)
+        self.lengths.insert(idx, length)
+        if length > self.longest:
+            self.longest = length
+
+    def conflicts(self, center: float, length: float, factor: float) -> bool:
+        """Algún empalme a menos de ``max(L1, L2) * factor`` del centro dado."""
+        # Radio máximo posible, con holgura para que el redondeo no excluya vecinos
+        radius = max(length, self.longest) * factor * (1 + 1e-9) + 1e-9
+        centers = self.centers
+        lengths = self.lengths
+        for idx in range(bisect_left(centers, center - radius), len(centers)):
+            existing_center = centers[idx]
+            if existing_center > center + radius:
+                break
+            if abs(center - existing_center) < max(length, lengths[idx]) * factor:
+                return True
+        return False
+
+
+MAX_SEGMENTS_PER_BAR = 100
+# Desplazamientos (m) que se prueban al mover un empalme en conflicto
+SPLICE_OFFSET_STEPS = (0.5, 1.0, 1.5, 2.0, 2.5, 3.0)
+
+
+def lap_splice(start: float, end: float, **extra: Any) -> Dict[str, Any]:
+    """Traslapo clase B entre ``start`` y ``end`` con los campos adicionales dados."""
+    splice = {"start": start, "end": end, "length": end - start, "type": "lap_splice_class_b"}
+    if extra:
+        splice.update(extra)
+    return splice
+
+
+def _segment(
+    bar: RebarDetail,
+    piece_index: int,
+    length: float,
+    start: float,
+    end: float,
+    label: str,
+    splices: Optional[List[Dict[str, Any]]] = None,
+) -> RebarDetail:
+    """Segmento de ``bar``; copia los campos comunes de la barra en lugar de reconstruirlos."""
+    return bar.model_copy(
+        update={
+            "id": f"{bar.id}-S{piece_index:02d}",
+            "length_m": length,
+            "start_m": start,
+            "end_m": end,
+            "splices": splices,
+            "notes": f"Segmento {piece_index} - {label}",
+        }
+    )
+
+
+# (longitud, inicio, fin) de cada segmento y los traslapos entre segmentos consecutivos
+SegmentTemplate = Tuple[Tuple[Tuple[float, float, float], ...], Tuple[Dict[str, Any], ...]]
+
+
+def _segment_template(bar: RebarDetail, segments: List[RebarDetail]) -> Optional[SegmentTemplate]:
+    """Geometría reutilizable de una segmentación; None si la barra quedó entera."""
+    if len(segments) == 1 and segments[0] is bar:
+        return None
+    geometry = tuple((segment.length_m, segment.start_m, segment.end_m) for segment in segments)
+    joints = tuple(dict(segment.splices[-1]) for segment in segments[:-1])
+    return geometry, joints
+
+
+def _stamp_segments(
+    bar: RebarDetail, template: Optional[SegmentTemplate], is_bottom_bar: bool
+) -> List[RebarDetail]:
+    """Segmentos de ``bar`` a partir de una plantilla, con ids y traslapos propios."""
+    if template is None:
+        return [bar]
+
+    geometry, template_joints = template
+    joints = [dict(joint) for joint in template_joints]
+    label = "Inferior" if is_bottom_bar else "Superior"
+    segments: List[RebarDetail] = []
+    for idx, (length, start, end) in enumerate(geometry):
+        segment_splices: List[Dict[str, Any]] = []
+        if idx > 0:
+            segment_splices.append(joints[idx - 1])
+        if idx < len(joints):
+            segment_splices.append(joints[idx])
+        segments.append(_segment(bar, idx + 1, length, start, end, label, segment_splices or None))
+    return segments
+
 
 class SegmentationMixin:
     def _split_bar_by_max_length(
@@ -16,7 +133,7 @@ class SegmentationMixin:
         *,
         max_length: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
         hook_length: float,
         edge_cover: float,
         beam_length: float,
@@ -36,28 +153,48 @@ class SegmentationMixin:
             )
             return [bar]
 
+        # Barras con la misma geometría producen los mismos segmentos sobre estas zonas
+        template_key = (
+            bar.start_m,
+            bar.end_m,
+            bar.length_m,
+            max_length,
+            splice_length,
+            hook_length,
+            edge_cover,
+            beam_length,
+            prefer_previous_zone,
+            splice_offset_ratio,
+            is_bottom_bar,
+        )
+        templates = zones.segment_templates
+        if template_key in templates:
+            return _stamp_segments(bar, templates[template_key], is_bottom_bar)
+
         if is_bottom_bar:
-            return self._split_bottom_bar_strategy(
+            segments = self._split_bottom_bar_strategy(
                 bar=bar,
                 max_length=max_length,
                 splice_length=splice_length,
-                prohibited_zones=prohibited_zones,
+                zones=zones,
                 hook_length=hook_length,
                 edge_cover=edge_cover,
                 beam_length=beam_length,
                 splice_offset_ratio=splice_offset_ratio,
             )
-
-        return self._split_top_bar_strategy(
-            bar=bar,
-            max_length=max_length,
-            splice_length=splice_length,
-            prohibited_zones=prohibited_zones,
-            hook_length=hook_length,
-            edge_cover=edge_cover,
-            beam_length=beam_length,
-            prefer_previous_zone=prefer_previous_zone,
-        )
+        else:
+            segments = self._split_top_bar_strategy(
+                bar=bar,
+                max_length=max_length,
+                splice_length=splice_length,
+                zones=zones,
+                hook_length=hook_length,
+                edge_cover=edge_cover,
+                beam_length=beam_length,
+                prefer_previous_zone=prefer_previous_zone,
+            )
+        templates[template_key] = _segment_template(bar, segments)
+        return segments
 
     def _split_top_bar_strategy(
         self,
@@ -65,7 +202,7 @@ class SegmentationMixin:
         bar: RebarDetail,
         max_length: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
         hook_length: float,
         edge_cover: float,
         beam_length: float,
@@ -82,11 +219,11 @@ class SegmentationMixin:
         segments: List[RebarDetail] = []
         joints: List[Dict[str, Any]] = []
         current_start = bar.start_m
-        piece_index = 1
-        safety_counter = 0
 
-        while current_start < bar.end_m - 1e-6 and safety_counter < 100:
-            safety_counter += 1
+        # Cada vuelta produce un segmento; el tope protege de ajustes que no avanzan
+        for piece_index in range(1, MAX_SEGMENTS_PER_BAR + 1):
+            if current_start >= bar.end_m - 1e-6:
+                break
             remaining_length = max(bar.end_m - current_start, 0.0)
             if remaining_length <= 0:
                 break
@@ -125,7 +262,7 @@ class SegmentationMixin:
                         joint_start=joint_start_candidate,
                         candidate_end=candidate_end,
                         splice_length=splice_length,
-                        prohibited_zones=prohibited_zones,
+                        zones=zones,
                     )
                     if preferred_end < candidate_end - tolerance:
                         candidate_end = preferred_end
@@ -139,27 +276,14 @@ class SegmentationMixin:
                     current_start,
                     candidate_end,
                     splice_length,
-                    prohibited_zones,
+                    zones,
                 )
 
             length = segment_end - current_start
             if length <= 0:
                 break
 
-            segment = RebarDetail(
-                id=f"{bar.id}-S{piece_index:02d}",
-                diameter=bar.diameter,
-                position=bar.position,
-                type=bar.type,
-                length_m=length,
-                start_m=current_start,
-                end_m=segment_end,
-                hook_type=bar.hook_type,
-                splices=None,
-                quantity=bar.quantity,
-                development_length_m=bar.development_length_m,
-                notes=f"Segmento {piece_index} - Superior",
-            )
+            segment = _segment(bar, piece_index, length, current_start, segment_end, "Superior")
             segments.append(segment)
 
             if segment_end >= bar.end_m - 1e-6:
@@ -168,26 +292,16 @@ class SegmentationMixin:
             joint_start = max(bar.start_m, segment_end - splice_length)
             joint_end = segment_end
 
-            if self._overlaps_prohibited_zone(joint_start, joint_end, prohibited_zones):
+            if zones.first_overlapping(joint_start, joint_end) is not None:
                 logger.warning(
                     "No se pudo ubicar el empalme de la barra %s fuera de zonas prohibidas",
                     bar.id,
                 )
 
-            joints.append(
-                {
-                    "start": joint_start,
-                    "end": joint_end,
-                    "length": joint_end - joint_start,
-                    "type": "lap_splice_class_b",
-                    "position": "top",
-                }
-            )
+            joints.append(lap_splice(joint_start, joint_end, position="top"))
 
             current_start = joint_start
-            piece_index += 1
-
-        if safety_counter >= 100:
+        else:
             logger.warning("Se alcanzó el límite de segmentación para la barra %s", bar.id)
 
         if not segments:
@@ -209,18 +323,21 @@ class SegmentationMixin:
         bar: RebarDetail,
         max_length: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
         hook_length: float,
         edge_cover: float,
         beam_length: float,
         splice_offset_ratio: float = 0.0,
     ) -> List[RebarDetail]:
-        logger.info(
-            "Dividiendo barra inferior %s con longitud total %.2fm",
-            bar.id,
-            bar.length_m,
-        )
-        logger.info("Offset ratio inferior aplicado: %.3f", splice_offset_ratio or 0.0)
+        # El nivel se consulta una vez; los mensajes del bucle se omiten si INFO está apagado
+        info_enabled = logger.isEnabledFor(logging.INFO)
+        if info_enabled:
+            logger.info(
+                "Dividiendo barra inferior %s con longitud total %.2fm",
+                bar.id,
+                bar.length_m,
+            )
+            logger.info("Offset ratio inferior aplicado: %.3f", splice_offset_ratio or 0.0)
 
         service = cast("BeamDetailingService", self)
         cover = max(service.min_edge_cover_m, edge_cover or 0.0)
@@ -240,12 +357,11 @@ class SegmentationMixin:
         segments: List[RebarDetail] = []
         joints: List[Dict[str, Any]] = []
         current_start = bar.start_m
-        piece_index = 1
-        safety_counter = 0
-        logged_first_segment = False
 
-        while current_start < bar.end_m - 1e-6 and safety_counter < 100:
-            safety_counter += 1
+        # Cada vuelta produce un segmento; el tope protege de ajustes que no avanzan
+        for piece_index in range(1, MAX_SEGMENTS_PER_BAR + 1):
+            if current_start >= bar.end_m - 1e-6:
+                break
             remaining_length = max(bar.end_m - current_start, 0.0)
             if remaining_length <= 0:
                 break
@@ -270,95 +386,47 @@ class SegmentationMixin:
 
             candidate_end = current_start + segment_length
             candidate_end = min(candidate_end, bar.end_m)
-            is_last_segment = candidate_end >= bar.end_m - tolerance
 
-            needs_zone_adjustment = True
-            corridor_target = None
-            if piece_index == 1 and not is_last_segment:
-                corridor_target = self._target_bottom_corridor_end(
-                    current_start=current_start,
-                    candidate_end=candidate_end,
-                    splice_length=splice_length,
-                    prohibited_zones=prohibited_zones,
+            candidate_end, is_last_segment, status = self._resolve_bottom_segment_end(
+                current_start=current_start,
+                candidate_end=candidate_end,
+                bar=bar,
+                splice_length=splice_length,
+                is_first=piece_index == 1,
+                zones=zones,
+            )
+            if status == SEGMENT_END_CORRIDOR and info_enabled:
+                logger.info(
+                    "Barra %s: empalme dirigido al corredor previo en %.2fm",
+                    bar.id,
+                    candidate_end,
                 )
-                if corridor_target is not None:
-                    candidate_end = min(bar.end_m, corridor_target)
-                    is_last_segment = candidate_end >= bar.end_m - tolerance
-                    needs_zone_adjustment = False
-                    logger.info(
-                        "Barra %s: empalme dirigido al corredor previo en %.2fm",
-                        bar.id,
-                        candidate_end,
-                    )
-
-            if piece_index == 1 and not is_last_segment and needs_zone_adjustment:
-                joint_start_candidate = max(bar.start_m, candidate_end - splice_length)
-                joint_end_candidate = candidate_end
-                if self._overlaps_prohibited_zone(
-                    joint_start_candidate, joint_end_candidate, prohibited_zones
-                ):
-                    safe_center = self._find_safe_splice_position(
-                        start_range=current_start + splice_length,
-                        end_range=candidate_end,
-                        splice_length=splice_length,
-                        prohibited_zones=prohibited_zones,
-                    )
-                    if safe_center is not None:
-                        candidate_end = min(bar.end_m, safe_center)
-                        joint_end_candidate = candidate_end
-                        joint_start_candidate = joint_end_candidate - splice_length
-                        needs_zone_adjustment = False
-                        logger.info(
-                            "Barra %s: empalme inicial reubicado en %.2fm",
-                            bar.id,
-                            joint_end_candidate,
-                        )
-                    else:
-                        logger.warning(
-                            "Barra %s: no se encontró corredor seguro para el primer empalme",
-                            bar.id,
-                        )
-                else:
-                    needs_zone_adjustment = False
-
-            if not is_last_segment and needs_zone_adjustment:
-                candidate_end = self._adjust_segment_end_for_splice_zones(
-                    current_start,
+            elif status == SEGMENT_END_SAFE_CENTER and info_enabled:
+                logger.info(
+                    "Barra %s: empalme inicial reubicado en %.2fm",
+                    bar.id,
                     candidate_end,
-                    splice_length,
-                    prohibited_zones,
                 )
-                if candidate_end >= bar.end_m - tolerance:
-                    is_last_segment = True
+            elif status == SEGMENT_END_NO_SAFE_CENTER:
+                logger.warning(
+                    "Barra %s: no se encontró corredor seguro para el primer empalme",
+                    bar.id,
+                )
 
             segment_end = bar.end_m if is_last_segment else candidate_end
             length = segment_end - current_start
             if length <= 0:
                 break
 
-            segment = RebarDetail(
-                id=f"{bar.id}-S{piece_index:02d}",
-                diameter=bar.diameter,
-                position=bar.position,
-                type=bar.type,
-                length_m=length,
-                start_m=current_start,
-                end_m=segment_end,
-                hook_type=bar.hook_type,
-                splices=None,
-                quantity=bar.quantity,
-                development_length_m=bar.development_length_m,
-                notes=f"Segmento {piece_index} - Inferior",
-            )
+            segment = _segment(bar, piece_index, length, current_start, segment_end, "Inferior")
             segments.append(segment)
 
-            if not logged_first_segment and piece_index == 1:
+            if info_enabled and piece_index == 1:
                 logger.info(
                     "Barra inferior %s: primer segmento=%.2fm",
                     bar.id,
                     length,
                 )
-                logged_first_segment = True
 
             if segment_end >= bar.end_m - 1e-6:
                 break
@@ -366,27 +434,18 @@ class SegmentationMixin:
             joint_start = max(bar.start_m, segment_end - splice_length)
             joint_end = segment_end
 
-            if self._overlaps_prohibited_zone(joint_start, joint_end, prohibited_zones):
+            if zones.first_overlapping(joint_start, joint_end) is not None:
                 logger.warning(
                     "Barra %s: empalme inferior aún cae en zona prohibida",
                     bar.id,
                 )
 
-            joints.append(
-                {
-                    "start": joint_start,
-                    "end": joint_end,
-                    "length": joint_end - joint_start,
-                    "type": "lap_splice_class_b",
-                    "position": "bottom",
-                }
-            )
-            logger.info("Barra inferior %s: empalme en %.2fm", bar.id, joint_end)
+            joints.append(lap_splice(joint_start, joint_end, position="bottom"))
+            if info_enabled:
+                logger.info("Barra inferior %s: empalme en %.2fm", bar.id, joint_end)
 
             current_start = joint_start
-            piece_index += 1
-
-        if safety_counter >= 100:
+        else:
             logger.warning("Se alcanzó el límite de segmentación para la barra %s", bar.id)
 
         if not segments:
@@ -402,6 +461,65 @@ class SegmentationMixin:
 
         return segments
 
+    def _resolve_bottom_segment_end(
+        self,
+        *,
+        current_start: float,
+        candidate_end: float,
+        bar: RebarDetail,
+        splice_length: float,
+        is_first: bool,
+        zones: ZoneIndex,
+    ) -> Tuple[float, bool, int]:
+        """Fin del segmento inferior, si es el último y cómo se resolvió (SEGMENT_END_*)."""
+        tolerance = 1e-3
+        is_last_segment = candidate_end >= bar.end_m - tolerance
+        needs_zone_adjustment = True
+        status = SEGMENT_END_DEFAULT
+
+        if is_first and not is_last_segment:
+            corridor_target = self._target_bottom_corridor_end(
+                current_start=current_start,
+                candidate_end=candidate_end,
+                splice_length=splice_length,
+                zones=zones,
+            )
+            if corridor_target is not None:
+                candidate_end = min(bar.end_m, corridor_target)
+                is_last_segment = candidate_end >= bar.end_m - tolerance
+                needs_zone_adjustment = False
+                status = SEGMENT_END_CORRIDOR
+
+        if is_first and not is_last_segment and needs_zone_adjustment:
+            joint_start_candidate = max(bar.start_m, candidate_end - splice_length)
+            if zones.first_overlapping(joint_start_candidate, candidate_end) is not None:
+                safe_center = self._find_safe_splice_position(
+                    start_range=current_start + splice_length,
+                    end_range=candidate_end,
+                    splice_length=splice_length,
+                    zones=zones,
+                )
+                if safe_center is not None:
+                    candidate_end = min(bar.end_m, safe_center)
+                    needs_zone_adjustment = False
+                    status = SEGMENT_END_SAFE_CENTER
+                else:
+                    status = SEGMENT_END_NO_SAFE_CENTER
+            else:
+                needs_zone_adjustment = False
+
+        if not is_last_segment and needs_zone_adjustment:
+            candidate_end = self._adjust_segment_end_for_splice_zones(
+                current_start,
+                candidate_end,
+                splice_length,
+                zones,
+            )
+            if candidate_end >= bar.end_m - tolerance:
+                is_last_segment = True
+
+        return candidate_end, is_last_segment, status
+
     def _prefer_splice_in_previous_corridor(
         self,
         *,
@@ -409,21 +527,22 @@ class SegmentationMixin:
         joint_start: float,
         candidate_end: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
     ) -> float:
         tolerance = 1e-3
         if splice_length <= 0:
             return candidate_end
 
-        before_zone = self._find_next_before_zone(joint_start, prohibited_zones)
-        if not before_zone:
+        before = zones.next_before(joint_start)
+        if before is None:
             return candidate_end
 
-        prev_end = self._find_zone_end_before(before_zone.start_m, prohibited_zones)
+        before_start = zones.starts[before]
+        prev_end = zones.end_before(before_start)
         if prev_end is None or prev_end < current_start + tolerance:
             return candidate_end
 
-        corridor_end = before_zone.start_m - tolerance
+        corridor_end = before_start - tolerance
         available = corridor_end - prev_end
         if available < splice_length - tolerance:
             return candidate_end
@@ -435,21 +554,12 @@ class SegmentationMixin:
 
         return target_end
 
-    @staticmethod
-    def _find_overlapping_zone(
-        start: float, end: float, zones: List[ProhibitedZone]
-    ) -> Optional[ProhibitedZone]:
-        for zone in zones:
-            if max(start, zone.start_m) < min(end, zone.end_m):
-                return zone
-        return None
-
     def _adjust_segment_end_for_splice_zones(
         self,
         current_start: float,
         candidate_end: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
     ) -> float:
         tolerance = 1e-3
         adjusted_end = candidate_end
@@ -460,14 +570,11 @@ class SegmentationMixin:
             joint_start = adjusted_end - splice_length
             if joint_start < current_start + tolerance:
                 joint_start = current_start + tolerance
-            if not self._overlaps_prohibited_zone(joint_start, adjusted_end, prohibited_zones):
+            hit = zones.first_overlapping(joint_start, adjusted_end)
+            if hit is None:
                 return adjusted_end
 
-            zone = self._find_overlapping_zone(joint_start, adjusted_end, prohibited_zones)
-            if not zone:
-                break
-
-            shifted_end = zone.start_m - tolerance
+            shifted_end = zones.starts[hit] - tolerance
             if shifted_end - splice_length <= current_start + tolerance:
                 return candidate_end
 
@@ -475,53 +582,24 @@ class SegmentationMixin:
 
         return adjusted_end
 
-    @staticmethod
-    def _find_next_zone_start(position: float, zones: List[ProhibitedZone]) -> Optional[float]:
-        tolerance = 1e-3
-        for zone in zones:
-            if zone.start_m >= position + tolerance:
-                return zone.start_m
-        return None
-
-    @staticmethod
-    def _find_zone_end_before(position: float, zones: List[ProhibitedZone]) -> Optional[float]:
-        tolerance = 1e-3
-        previous_end = None
-        for zone in zones:
-            if zone.end_m < position - tolerance:
-                previous_end = zone.end_m
-            else:
-                break
-        return previous_end
-
-    @staticmethod
-    def _find_next_before_zone(position: float, zones: List[ProhibitedZone]) -> Optional[ProhibitedZone]:
-        tolerance = 1e-3
-        for zone in zones:
-            if zone.start_m >= position + tolerance:
-                description = (zone.description or "").lower()
-                if "antes" in description:
-                    return zone
-        return None
-
     def _coordinate_splice_positions(
         self,
         top_bars: List[RebarDetail],
         bottom_bars: List[RebarDetail],
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
         beam_length: float,
     ) -> Tuple[List[RebarDetail], List[RebarDetail]]:
         if not bottom_bars or beam_length <= 0:
             return top_bars, bottom_bars
 
-        existing_splices: List[Dict[str, Any]] = []
+        existing_splices = _SpliceCenters()
         for bar in top_bars:
             if not bar.splices:
                 continue
             for splice in bar.splices:
                 length = splice.get("length") or max(splice.get("end", 0.0) - splice.get("start", 0.0), 0.0)
                 center = (splice.get("start", 0.0) + splice.get("end", 0.0)) / 2
-                existing_splices.append({"center": center, "length": length, "type": "top"})
+                existing_splices.add(center, length)
 
         for bar in bottom_bars:
             if not bar.splices:
@@ -532,22 +610,15 @@ class SegmentationMixin:
                 if length <= 0:
                     continue
                 original_center = (splice.get("start", 0.0) + splice.get("end", 0.0)) / 2
-                has_conflict = False
-                for existing in existing_splices:
-                    min_distance = max(length, existing["length"]) * 1.5
-                    if abs(original_center - existing["center"]) < min_distance:
-                        has_conflict = True
-                        break
-
-                if not has_conflict:
-                    existing_splices.append({"center": original_center, "length": length, "type": "bottom"})
+                if not existing_splices.conflicts(original_center, length, 1.5):
+                    existing_splices.add(original_center, length)
                     continue
 
                 new_center = self._find_non_conflicting_splice_position(
                     original_center=original_center,
                     splice_length=length,
                     existing_splice_positions=existing_splices,
-                    prohibited_zones=prohibited_zones,
+                    zones=zones,
                     beam_length=beam_length,
                     bar_id=bar.id,
                 )
@@ -562,9 +633,9 @@ class SegmentationMixin:
                     splice["original_center"] = original_center
                     bar_adjusted = True
                     final_center = (new_start + new_end) / 2
-                    existing_splices.append({"center": final_center, "length": splice["length"], "type": "bottom"})
+                    existing_splices.add(final_center, splice["length"])
                 else:
-                    existing_splices.append({"center": original_center, "length": length, "type": "bottom"})
+                    existing_splices.add(original_center, length)
                     logger.warning(
                         "Barra %s: no se pudo evitar coincidencia de empalme en %.2fm",
                         bar.id,
@@ -584,8 +655,8 @@ class SegmentationMixin:
         *,
         original_center: float,
         splice_length: float,
-        existing_splice_positions: List[Dict[str, Any]],
-        prohibited_zones: List[ProhibitedZone],
+        existing_splice_positions: _SpliceCenters,
+        zones: ZoneIndex,
         beam_length: float,
         bar_id: str,
         max_attempts: int = 10,
@@ -593,26 +664,18 @@ class SegmentationMixin:
         if splice_length <= 0:
             return None
 
-        service = cast("BeamDetailingService", self)
-        offset_candidates = [0.5, 1.0, 1.5, 2.0, 2.5, 3.0]
-        attempts = 0
-        while attempts < max_attempts:
-            for magnitude in offset_candidates:
-                for direction in (1, -1):
-                    test_center = original_center + direction * magnitude * (attempts + 1)
-                    if test_center < splice_length / 2 or test_center > beam_length - splice_length / 2:
-                        continue
-                    if service._is_in_prohibited_zone(test_center, prohibited_zones, splice_length):
-                        continue
-                    conflict = False
-                    for existing in existing_splice_positions:
-                        min_distance = max(splice_length, existing["length"]) * 1.2
-                        if abs(test_center - existing["center"]) < min_distance:
-                            conflict = True
-                            break
-                    if not conflict:
-                        return test_center
-            attempts += 1
+        candidates = offset_candidates(original_center, SPLICE_OFFSET_STEPS, max_attempts)
+        hit = first_valid_center(
+            candidates,
+            zones.start_array,
+            zones.end_array,
+            np.array(existing_splice_positions.centers, dtype=np.float64),
+            np.array(existing_splice_positions.lengths, dtype=np.float64),
+            float(splice_length),
+            float(beam_length),
+        )
+        if hit >= 0:
+            return float(candidates[hit])
 
         logger.debug("Barra %s: no se encontró posición alternativa para el empalme", bar_id)
         return None
@@ -623,35 +686,22 @@ class SegmentationMixin:
         start_range: float,
         end_range: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
         step: float = 0.1,
     ) -> Optional[float]:
         tolerance = 1e-3
         if splice_length <= 0 or end_range - start_range <= tolerance:
             return None
 
-        test_positions: List[float] = []
-        pos = start_range
-        while pos <= end_range + tolerance:
-            test_positions.append(pos)
-            pos += max(step, tolerance)
-
-        for i in range(len(test_positions) - 1):
-            mid = (test_positions[i] + test_positions[i + 1]) / 2
-            test_positions.append(mid)
-
-        for position in sorted(set(test_positions)):
-            splice_start = position - splice_length / 2
-            splice_end = position + splice_length / 2
-            overlaps = False
-            for zone in prohibited_zones:
-                if max(splice_start, zone.start_m) < min(splice_end, zone.end_m):
-                    overlaps = True
-                    break
-            if not overlaps:
-                return position
-
-        return None
+        center = safe_splice_center(
+            float(start_range),
+            float(end_range),
+            float(splice_length),
+            float(step),
+            zones.start_array,
+            zones.end_array,
+        )
+        return None if math.isnan(center) else center
 
     def _target_bottom_corridor_end(
         self,
@@ -659,18 +709,19 @@ class SegmentationMixin:
         current_start: float,
         candidate_end: float,
         splice_length: float,
-        prohibited_zones: List[ProhibitedZone],
+        zones: ZoneIndex,
     ) -> Optional[float]:
         tolerance = 1e-3
-        before_zone = self._find_next_before_zone(current_start, prohibited_zones)
-        if not before_zone:
+        before = zones.next_before(current_start)
+        if before is None:
             return None
 
-        prev_end = self._find_zone_end_before(before_zone.start_m, prohibited_zones)
+        before_start = zones.starts[before]
+        prev_end = zones.end_before(before_start)
         if prev_end is None:
             return None
 
-        corridor_end = before_zone.start_m - tolerance
+        corridor_end = before_start - tolerance
         target = prev_end + splice_length
         target = min(target, corridor_end, candidate_end)
         if target - current_start < splice_length - tolerance:
@@ -678,13 +729,6 @@ class SegmentationMixin:
 
         return target
 
-    @staticmethod
-    def _overlaps_prohibited_zone(start: float, end: float, zones: List[ProhibitedZone]) -> bool:
-        for zone in zones:
-            if max(start, zone.start_m) < min(end, zone.end_m):
-                return True
-        return False
-
     def _rebuild_splices_from_geometry(self, bars: List[RebarDetail]) -> None:
         if not bars:
             return
@@ -708,13 +752,7 @@ class SegmentationMixin:
                 if overlap_end - overlap_start <= tolerance:
                     continue
 
-                splice_payload = {
-                    "start": overlap_start,
-                    "end": overlap_end,
-                    "length": overlap_end - overlap_start,
-                    "type": "lap_splice_class_b",
-                    "position": current.position,
-                }
+                splice_payload = lap_splice(overlap_start, overlap_end, position=current.position)
 
                 for segment in (current, following):
                     splice_entry = splice_payload.copy()
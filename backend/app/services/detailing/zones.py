@@ -0,0 +1,86 @@
+"""Índice ordenado de zonas prohibidas para consultas por bisección."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from itertools import accumulate
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.tools.despiece import ProhibitedZone
+
+ZONE_TOLERANCE = 1e-3
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneIndex:
+    """Zonas ordenadas por inicio con sus límites en listas y arreglos paralelos.
+
+    ``reach[i]`` es el mayor ``end_m`` entre las zonas ``0..i``; como las zonas
+    pueden solaparse, es la secuencia monótona sobre la que se bisecta por fin.
+    """
+
+    zones: Tuple[ProhibitedZone, ...]
+    starts: List[float]
+    ends: List[float]
+    reach: List[float]
+    bounds: np.ndarray
+    start_array: np.ndarray
+    end_array: np.ndarray
+    before_positions: List[int]
+    # Segmentaciones ya calculadas sobre estas zonas (ver SegmentationMixin)
+    segment_templates: Dict[Tuple[Any, ...], Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, zones: Sequence[ProhibitedZone]) -> "ZoneIndex":
+        ordered = tuple(sorted(zones, key=attrgetter("start_m")))
+        starts = [zone.start_m for zone in ordered]
+        ends = [zone.end_m for zone in ordered]
+        # (inicio, fin) contiguos por zona; las columnas son vistas para los núcleos
+        bounds = np.array(list(zip(starts, ends)), dtype=np.float64).reshape(len(ordered), 2)
+        before_flags = np.array(
+            ["antes" in (zone.description or "").lower() for zone in ordered], dtype=np.bool_
+        )
+        return cls(
+            zones=ordered,
+            starts=starts,
+            ends=ends,
+            reach=list(accumulate(ends, max)),
+            bounds=bounds,
+            start_array=bounds[:, 0],
+            end_array=bounds[:, 1],
+            before_positions=np.flatnonzero(before_flags).tolist(),
+        )
+
+    def first_overlapping(self, start: float, end: float) -> Optional[int]:
+        """Índice de la primera zona con intersección abierta con [start, end]."""
+        if not start < end:
+            return None
+        idx = bisect_right(self.reach, start)
+        if idx < len(self.starts) and self.starts[idx] < end:
+            return idx
+        return None
+
+    def next_start(self, position: float) -> Optional[int]:
+        """Índice de la primera zona que inicia después de ``position``."""
+        idx = bisect_left(self.starts, position + ZONE_TOLERANCE)
+        return idx if idx < len(self.starts) else None
+
+    def next_before(self, position: float) -> Optional[int]:
+        """Índice de la primera zona 'antes de' un apoyo que inicia después de ``position``."""
+        first = bisect_left(self.starts, position + ZONE_TOLERANCE)
+        candidate = bisect_left(self.before_positions, first)
+        if candidate < len(self.before_positions):
+            return self.before_positions[candidate]
+        return None
+
+    def end_before(self, position: float) -> Optional[float]:
+        """Fin de la última zona recorrida antes de alcanzar ``position``."""
+        idx = bisect_left(self.reach, position - ZONE_TOLERANCE)
+        return self.ends[idx - 1] if idx else None
+
+
+__all__ = ["ZONE_TOLERANCE", "ZoneIndex"]
@@ -1,11 +1,20 @@
-from typing import Dict, List, Optional, Any, Tuple, Literal
-from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Any, Tuple, Literal
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+import heapq
 import math
 import logging
-from collections import Counter, defaultdict
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
 
 from app.schemas.tools.despiece import (
     DetailingResults,
+    HookType,
     RebarDetail,
     ProhibitedZone,
     MaterialItem,
@@ -17,13 +26,22 @@ from app.schemas.tools.despiece import (
 from app.modules.stirrups import (
     DEFAULT_STIRRUP_DIAMETER,
     DEFAULT_STIRRUP_HOOK_TYPE,
-    calculate_effective_depth,
-    calculate_spacing_for_zone,
+    calculate_effective_depths,
+    calculate_spacings_for_zone,
     derive_confined_segments,
     derive_unconfined_segments,
     extract_splice_segments,
 )
-from app.services.detailing.segmentation import SegmentationMixin
+from app.services.detailing.batch import RebarBatch
+from app.services.detailing.kernels import (
+    intervals_overlap,
+    segment_span_overlaps,
+    splice_conflicts,
+    splice_positions,
+    zone_bounds,
+)
+from app.services.detailing.segmentation import SegmentationMixin, lap_splice
+from app.services.detailing.zones import ZoneIndex
 
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -34,89 +52,182 @@ if not logger.handlers:
 logger.setLevel(logging.INFO)
 logger.propagate = False
 
+_DES_VALID_HOOKS = frozenset({HookType.H135, HookType.H180})
+# Centros de empalme de barras inferiores (fracción de la longitud) por grupo de desfase
+_BOTTOM_SPLICE_RATIOS = (
+    np.array([0.33, 0.67]),
+    np.array([0.40, 0.60]),
+    np.array([0.25, 0.50]),
+)
+# Desfase relativo de empalmes en la segmentación de barras inferiores, por barra
+_BOTTOM_OFFSET_RATIOS = (0.08, 0.16, 0.24)
+# Longitudes de desarrollo y traslapo para diámetros sin tabla
+_DEFAULT_DEVELOPMENT = MappingProxyType({'development': 0.6, 'splice': 0.78})
+
+
+# Tablas NSR-10 de solo lectura, compartidas por todas las instancias del servicio
+
+# Factores NSR-10 según clase de disipación de energía
+_ENERGY_FACTORS: Mapping[str, float] = MappingProxyType({
+    'DES': 1.3,  # Alta disipación - Empalmes Clase B
+    'DMO': 1.0,  # Disipación moderada
+    'DMI': 1.0   # Disipación mínima
+})
+
+_HOOK_LENGTH_TABLE: Mapping[str, Mapping[str, Optional[float]]] = MappingProxyType({
+    '#2': {'90': 0.10, '180': 0.080, '135': 0.075},
+    '#3': {'90': 0.15, '180': 0.130, '135': 0.080},
+    '#4': {'90': 0.20, '180': 0.150, '135': 0.127},
+    '#5': {'90': 0.25, '180': 0.180, '135': 0.159},
+    '#6': {'90': 0.30, '180': 0.210, '135': 0.191},
+    '#7': {'90': 0.36, '180': 0.250, '135': 0.222},
+    '#8': {'90': 0.41, '180': 0.300, '135': 0.254},
+    '#9': {'90': 0.49, '180': 0.340, '135': None},
+    '#10': {'90': 0.54, '180': 0.400, '135': None},
+    '#11': {'90': 0.59, '180': 0.430, '135': None},
+    '#14': {'90': 0.80, '180': 0.445, '135': None},
+    '#18': {'90': 1.03, '180': 0.572, '135': None},
+})
+# Vista plana (diámetro, gancho) -> longitud; omite combinaciones sin valor tabulado
+_HOOK_LOOKUP: Mapping[Tuple[str, str], float] = MappingProxyType({
+    (diameter, hook): float(length)
+    for diameter, row in _HOOK_LENGTH_TABLE.items()
+    for hook, length in row.items()
+    if length
+})
+
+# Pesos por metro lineal según diámetro (kg/m) - NSR-10 Anexo C
+_REBAR_WEIGHTS: Mapping[str, float] = MappingProxyType({
+    '#3': 0.56, '#4': 1.00, '#5': 1.55, '#6': 2.26,
+    '#7': 3.04, '#8': 3.97, '#9': 5.06, '#10': 6.40,
+    '#11': 7.91, '#14': 14.60, '#18': 23.70
+})
+# Diámetros admitidos en la configuración de barras
+_VALID_DIAMETERS = frozenset(_REBAR_WEIGHTS)
+# Número de cada diámetro (#6 -> 6) para ordenar de mayor a menor
+_DIAMETER_NUM: Mapping[str, int] = MappingProxyType(
+    {diameter: int(diameter[1:]) for diameter in _REBAR_WEIGHTS}
+)
+
+# Longitudes de desarrollo base (m) para fy=420MPa, f'c=21MPa
+# NSR-10 C.12.2 - Valores simplificados
+_BASE_DEVELOPMENT_LENGTHS: Mapping[str, float] = MappingProxyType({
+    '#3': 0.30, '#4': 0.40, '#5': 0.50, '#6': 0.60,
+    '#7': 0.70, '#8': 0.80, '#9': 0.90, '#10': 1.00,
+    '#11': 1.10, '#14': 1.40, '#18': 1.80
+})
+
+# Factores de ajuste para diferentes resistencias de concreto
+_FC_FACTORS: Mapping[str, float] = MappingProxyType({
+    '21 MPa (3000 psi)': 1.0,
+    '24 MPa (3500 psi)': 0.92,
+    '28 MPa (4000 psi)': 0.85,
+    '32 MPa (4600 psi)': 0.80
+})
+
+_FC_COLUMN_MAP: Mapping[str, str] = MappingProxyType({
+    '21 MPa (3000 psi)': 'fc_21_mpa_m',
+    '24 MPa (3500 psi)': 'fc_24_mpa_m',
+    '28 MPa (4000 psi)': 'fc_28_mpa_m',
+    '32 MPa (4600 psi)': 'fc_28_mpa_m',
+})
+
+# Factores para diferentes grados de acero
+_FY_FACTORS: Mapping[str, float] = MappingProxyType({
+    '420 MPa (Grado 60)': 1.0,
+    '520 MPa (Grado 75)': 1.25
+})
+
+
+@lru_cache(maxsize=128)
+def _development_lengths_table(
+    concrete_strength: str,
+    reinforcement: str,
+    energy_class: str,
+    lap_overrides: Tuple[Tuple[str, Any], ...],
+) -> Mapping[str, Mapping[str, float]]:
+    """Tabla inmutable de desarrollo/traslape por diámetro para una combinación de materiales"""
+    development_lengths = {}
+    fc_factor = _FC_FACTORS.get(concrete_strength, 1.0)
+    fy_factor = _FY_FACTORS.get(reinforcement, 1.0)
+    energy_factor = _ENERGY_FACTORS.get(energy_class, 1.0)
+    overrides = dict(lap_overrides)
+
+    for diameter, base_length in _BASE_DEVELOPMENT_LENGTHS.items():
+        # Longitud básica ajustada por f'c y fy
+        adjusted_length = base_length * fc_factor * fy_factor
+
+        # Para empalmes clase B en zonas sísmicas
+        splice_length = adjusted_length * energy_factor
+        lap_value = overrides.get(diameter)
+        if lap_value:
+            splice_length = float(lap_value)
+
+        development_lengths[diameter] = MappingProxyType({
+            'development': adjusted_length,
+            'splice': splice_length
+        })
+
+    return MappingProxyType(development_lengths)
+
 
 class DetailingDebugger:
     """Pequeño ayudante para exponer el avance del cálculo en los logs."""
 
+    __slots__ = ("step", "name", "_enabled", "_errors_enabled")
+
     def __init__(self, name: str = "detailing") -> None:
         self.step = 0
         self.name = name.upper()
+        # El nivel se consulta una sola vez por cálculo
+        self._enabled = logger.isEnabledFor(logging.INFO)
+        self._errors_enabled = logger.isEnabledFor(logging.ERROR)
 
     def log(self, message: str, **context: Any) -> None:
         self.step += 1
-        context_str = " ".join(
-            f"{key}={value}" for key, value in context.items() if value is not None
-        )
-        if context_str:
-            logger.info("%s[%02d] %s | %s", self.name, self.step, message, context_str)
+        if not self._enabled:
+            return
+        items = [(key, value) for key, value in context.items() if value is not None]
+        if items:
+            # Los flotantes se formatean con dos decimales solo si el registro se emite
+            context_fmt = " ".join(
+                f"{key}=%.2f" if isinstance(value, float) else f"{key}=%s" for key, value in items
+            )
+            logger.info(
+                "%s[%02d] %s | " + context_fmt,
+                self.name,
+                self.step,
+                message,
+                *(value for _, value in items),
+            )
         else:
             logger.info("%s[%02d] %s", self.name, self.step, message)
 
     def error(self, message: str) -> None:
+        if not self._errors_enabled:
+            return
         logger.error("%s[ERR] %s", self.name, message)
 
+
+@dataclass(frozen=True, slots=True)
+class CoordinatesBundle:
+    """Geometría de la viga a lo largo del eje (m)."""
+
+    faces: List[Dict[str, Any]]
+    centers: List[Dict[str, Any]]
+    spans: List[Dict[str, Any]]
+    supports: List[Dict[str, Any]]
+    total_length: float
+    # Estadísticas de luces que consultan los distribuidores de barras
+    mean_span_length: float = 0.0
+    longest_span_index: int = -1
+
+
 class BeamDetailingService(SegmentationMixin):
     """Servicio para cálculo de despiece automático según NSR-10"""
     
     def __init__(self):
-        # Factores NSR-10 según clase de disipación de energía
-        self.energy_factors = {
-            'DES': 1.3,  # Alta disipación - Empalmes Clase B
-            'DMO': 1.0,  # Disipación moderada
-            'DMI': 1.0   # Disipación mínima
-        }
-
         self.min_edge_cover_m = 0.05  # 5 cm mínimo en extremos
-        self.hook_length_table = {
-            '#2': {'90': 0.10, '180': 0.080, '135': 0.075},
-            '#3': {'90': 0.15, '180': 0.130, '135': 0.080},
-            '#4': {'90': 0.20, '180': 0.150, '135': 0.127},
-            '#5': {'90': 0.25, '180': 0.180, '135': 0.159},
-            '#6': {'90': 0.30, '180': 0.210, '135': 0.191},
-            '#7': {'90': 0.36, '180': 0.250, '135': 0.222},
-            '#8': {'90': 0.41, '180': 0.300, '135': 0.254},
-            '#9': {'90': 0.49, '180': 0.340, '135': None},
-            '#10': {'90': 0.54, '180': 0.400, '135': None},
-            '#11': {'90': 0.59, '180': 0.430, '135': None},
-            '#14': {'90': 0.80, '180': 0.445, '135': None},
-            '#18': {'90': 1.03, '180': 0.572, '135': None},
-        }
-        
-        # Pesos por metro lineal según diámetro (kg/m) - NSR-10 Anexo C
-        self.rebar_weights = {
-            '#3': 0.56, '#4': 1.00, '#5': 1.55, '#6': 2.26,
-            '#7': 3.04, '#8': 3.97, '#9': 5.06, '#10': 6.40,
-            '#11': 7.91, '#14': 14.60, '#18': 23.70
-        }
-        
-        # Longitudes de desarrollo base (m) para fy=420MPa, f'c=21MPa
-        # NSR-10 C.12.2 - Valores simplificados
-        self.base_development_lengths = {
-            '#3': 0.30, '#4': 0.40, '#5': 0.50, '#6': 0.60,
-            '#7': 0.70, '#8': 0.80, '#9': 0.90, '#10': 1.00,
-            '#11': 1.10, '#14': 1.40, '#18': 1.80
-        }
-        
-        # Factores de ajuste para diferentes resistencias de concreto
-        self.fc_factors = {
-            '21 MPa (3000 psi)': 1.0,
-            '24 MPa (3500 psi)': 0.92,
-            '28 MPa (4000 psi)': 0.85,
-            '32 MPa (4600 psi)': 0.80
-        }
-
-        self.fc_column_map = {
-            '21 MPa (3000 psi)': 'fc_21_mpa_m',
-            '24 MPa (3500 psi)': 'fc_24_mpa_m',
-            '28 MPa (4000 psi)': 'fc_28_mpa_m',
-            '32 MPa (4600 psi)': 'fc_28_mpa_m',
-        }
-        
-        # Factores para diferentes grados de acero
-        self.fy_factors = {
-            '420 MPa (Grado 60)': 1.0,
-            '520 MPa (Grado 75)': 1.25
-        }
     
     def compute_detailing(self, data: Dict[str, Any]) -> DetailingResponse:
         """
@@ -128,7 +239,7 @@ class BeamDetailingService(SegmentationMixin):
         Returns:
             DetailingResponse con los resultados del cálculo
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         debugger = DetailingDebugger()
         debugger.log(
             "Inicio de cálculo",
@@ -151,16 +262,16 @@ class BeamDetailingService(SegmentationMixin):
                 )
             debugger.log(
                 "Datos preprocesados",
-                top_bars=len(beam_data.get('top_bars', [])),
-                bottom_bars=len(beam_data.get('bottom_bars', [])),
+                top_bars=beam_data['top_bars'].total(),
+                bottom_bars=beam_data['bottom_bars'].total(),
             )
             
             # 2. Calcular geometría de la viga
             coordinates = self._calculate_coordinates(beam_data)
             debugger.log(
                 "Geometría calculada",
-                total_length=f"{coordinates.get('total_length', 0):.2f}m",
-                spans=len(coordinates.get('spans', [])),
+                total_length_m=coordinates.total_length,
+                spans=len(coordinates.spans),
             )
             
             # 3. Identificar barras continuas obligatorias (NSR-10 C.21.5.2.1)
@@ -174,6 +285,8 @@ class BeamDetailingService(SegmentationMixin):
             # 4. Calcular zonas prohibidas para empalmes (NSR-10 C.21.5.3.2)
             prohibited_zones = self._calculate_prohibited_zones(coordinates, beam_data)
             debugger.log("Zonas prohibidas calculadas", zonas=len(prohibited_zones))
+            # Índice de zonas compartido por la segmentación y la coordinación de empalmes
+            zones = ZoneIndex.build(prohibited_zones)
             
             # 5. Calcular longitud de desarrollo ajustada
             development_lengths = self._calculate_development_lengths(beam_data)
@@ -181,14 +294,14 @@ class BeamDetailingService(SegmentationMixin):
             
             # 6. Generar detalle de barras superiores
             top_bars = self._detail_top_bars(
-                beam_data, coordinates, prohibited_zones, 
+                beam_data, coordinates, prohibited_zones, zones,
                 continuous_bars, development_lengths
             )
             debugger.log("Detalle barras superiores", barras=len(top_bars))
             
             # 7. Generar detalle de barras inferiores
             bottom_bars = self._detail_bottom_bars(
-                beam_data, coordinates, prohibited_zones,
+                beam_data, coordinates, prohibited_zones, zones,
                 continuous_bars, development_lengths
             )
             debugger.log("Detalle barras inferiores", barras=len(bottom_bars))
@@ -196,8 +309,8 @@ class BeamDetailingService(SegmentationMixin):
             top_bars, bottom_bars = self._coordinate_splice_positions(
                 top_bars,
                 bottom_bars,
-                prohibited_zones,
-                coordinates['total_length'],
+                zones,
+                coordinates.total_length,
             )
             self._rebuild_splices_from_geometry(top_bars)
             self._rebuild_splices_from_geometry(bottom_bars)
@@ -217,13 +330,13 @@ class BeamDetailingService(SegmentationMixin):
             max_bar_length = beam_data.get('max_bar_length_m', 12.0)
             self._apply_cover_and_hook_adjustments(
                 top_bars,
-                coordinates['total_length'],
+                coordinates.total_length,
                 edge_cover,
                 max_bar_length,
             )
             self._apply_cover_and_hook_adjustments(
                 bottom_bars,
-                coordinates['total_length'],
+                coordinates.total_length,
                 edge_cover,
                 max_bar_length,
             )
@@ -236,9 +349,8 @@ class BeamDetailingService(SegmentationMixin):
             )
             
             # 9. Optimizar cortes y generar lista de materiales
-            material_list = self._generate_material_list(
-                top_bars + bottom_bars, beam_data
-            )
+            batch = RebarBatch.from_bars(top_bars, bottom_bars)
+            material_list, total_weight = self._generate_material_list(batch, beam_data)
             debugger.log(
                 "Lista de materiales generada",
                 items=len(material_list),
@@ -246,14 +358,12 @@ class BeamDetailingService(SegmentationMixin):
             
             # 10. Validaciones NSR-10
             warnings = self._validate_nsr10(
-                beam_data, top_bars, bottom_bars, 
-                prohibited_zones, continuous_bars
+                beam_data, batch, prohibited_zones, continuous_bars
             )
             debugger.log("Validaciones NSR-10 completadas", advertencias=len(warnings))
             
             # 11. Calcular métricas generales
-            total_weight = sum(item.weight_kg for item in material_list)
-            total_bars = len(top_bars) + len(bottom_bars)
+            total_bars = len(batch.bars)
             
             # 12. Preparar resultados
             results = DetailingResults(
@@ -269,12 +379,12 @@ class BeamDetailingService(SegmentationMixin):
                 stirrups_summary=stirrups_summary,
             )
             
-            computation_time = (datetime.now() - start_time).total_seconds() * 1000
-            logger.info(f"Cálculo completado en {computation_time:.2f}ms")
+            computation_time = (time.perf_counter_ns() - start_ns) / 1e6
+            logger.info("Cálculo completado en %.2fms", computation_time)
             debugger.log(
                 "Cálculo finalizado",
-                tiempo_ms=f"{computation_time:.2f}",
-                peso_total=f"{total_weight:.2f}kg",
+                tiempo_ms=computation_time,
+                peso_total_kg=float(total_weight),
             )
             
             return DetailingResponse(
@@ -285,7 +395,7 @@ class BeamDetailingService(SegmentationMixin):
             )
             
         except Exception as e:
-            logger.error(f"Error en cálculo de despiece: {str(e)}", exc_info=True)
+            logger.error("Error en cálculo de despiece: %s", e, exc_info=True)
             debugger.error(f"Excepción: {str(e)}")
             return DetailingResponse(
                 success=False,
@@ -296,15 +406,23 @@ class BeamDetailingService(SegmentationMixin):
     
     def _preprocess_data(self, data: Dict) -> Optional[Dict]:
         """Valida y preprocesa los datos de entrada"""
+        # Validar el gancho una sola vez (fuera del try para no ocultar el motivo):
+        # las barras internas se construyen sin validación
+        try:
+            hook_type = HookType(data.get('hook_type', '135'))
+        except ValueError:
+            raise ValueError('Hook type debe ser "90", "135" o "180"') from None
+
         try:
             processed = data.copy()
+            processed['hook_type'] = hook_type
             
             # Validar datos requeridos
             required_fields = ['span_geometries', 'axis_supports', 'top_bars_config', 
                              'bottom_bars_config', 'concrete_strength', 'reinforcement']
             for field in required_fields:
                 if field not in processed:
-                    logger.error(f"Campo requerido faltante: {field}")
+                    logger.error("Campo requerido faltante: %s", field)
                     return None
             
             # Convertir longitud máxima de barras
@@ -314,7 +432,7 @@ class BeamDetailingService(SegmentationMixin):
             except ValueError:
                 processed['max_bar_length_m'] = 12.0
             
-            # Expandir configuraciones de barras
+            # Agrupar configuraciones de barras por diámetro
             processed['top_bars'] = self._expand_bar_config(processed.get('top_bars_config', []))
             processed['bottom_bars'] = self._expand_bar_config(processed.get('bottom_bars_config', []))
             
@@ -331,126 +449,136 @@ class BeamDetailingService(SegmentationMixin):
             else:
                 processed['effective_depth_m'] = 0.45  # Valor por defecto
 
+            # Posiciones acumuladas de apoyos y luces (SoA) para _calculate_coordinates
+            processed['_coords_np'] = self._build_axis_arrays(spans, processed.get('axis_supports', []))
+
             cover_cm = processed.get('cover_cm', 5) or 5
             processed['edge_cover_m'] = max(self.min_edge_cover_m, cover_cm / 100)
             
             return processed
             
         except Exception as e:
-            logger.error(f"Error en preprocesamiento: {str(e)}")
+            logger.error("Error en preprocesamiento: %s", e)
             return None
     
-    def _expand_bar_config(self, config: List[Dict]) -> List[str]:
-        """Convierte configuración de barras a lista expandida"""
-        bars = []
+    def _expand_bar_config(self, config: List[Dict]) -> Counter:
+        """Convierte configuración de barras a cantidades por diámetro"""
+        bars: Counter = Counter()
         for group in config:
             try:
                 quantity = int(group.get('quantity', 0))
                 diameter = str(group.get('diameter', '')).strip()
-                if quantity > 0 and diameter and diameter in self.rebar_weights:
-                    bars.extend([diameter] * quantity)
+                if quantity > 0 and diameter in _VALID_DIAMETERS:
+                    bars[diameter] += quantity
             except (ValueError, TypeError):
                 continue
         return bars
     
-    def _calculate_coordinates(self, beam_data: Dict) -> Dict:
+    @staticmethod
+    def _build_axis_arrays(spans: List[Dict], supports: List[Dict]) -> Dict[str, Any]:
+        """Posiciones acumuladas de apoyos y luces como arreglos NumPy (SoA)"""
+        n_supports = len(supports)
+        n_pairs = min(n_supports, len(spans))
+        support_widths = np.fromiter(
+            (support.get('support_width_cm', 0) / 100.0 for support in supports), np.float64, n_supports
+        )
+        span_lengths = np.fromiter(
+            (spans[i].get('clear_span_between_supports_m', 0) for i in range(n_pairs)), np.float64, n_pairs
+        )
+
+        # Secuencia apoyo, luz, apoyo, luz... (las luces sin apoyo previo se ignoran)
+        increments = np.empty(n_supports + n_pairs, dtype=np.float64)
+        increments[0:2 * n_pairs:2] = support_widths[:n_pairs]
+        increments[1:2 * n_pairs:2] = span_lengths
+        increments[2 * n_pairs:] = support_widths[n_pairs:]
+        positions = np.concatenate(([0.0], np.cumsum(increments)))
+
+        return {
+            'support_x': np.concatenate((positions[0:2 * n_pairs:2], positions[2 * n_pairs:-1])),
+            'support_widths': support_widths,
+            'span_x': positions[1:2 * n_pairs:2],
+            'span_lengths': span_lengths,
+            'total_length': float(positions[-1]),
+        }
+
+    def _calculate_coordinates(self, beam_data: Dict) -> CoordinatesBundle:
         """Calcula coordenadas a lo largo de la viga"""
         spans = beam_data.get('span_geometries', [])
         supports = beam_data.get('axis_supports', [])
+        axis = beam_data.get('_coords_np') or self._build_axis_arrays(spans, supports)
+        support_x = axis['support_x'].tolist()
+        support_widths = axis['support_widths'].tolist()
+        span_x = axis['span_x'].tolist()
+        span_lengths = axis['span_lengths'].tolist()
         
-        current_x = 0.0
-        coordinates = {
-            'faces': [],      # Caras de apoyos
-            'centers': [],    # Centros de luces
-            'spans': [],      # Intervalos de luces
-            'supports': [],   # Intervalos de apoyos
-            'total_length': 0
-        }
+        n_pairs = len(span_x)
+        labels = [support.get('label', f'EJE {i+1}') for i, support in enumerate(supports)]
         
-        # Procesar cada apoyo y luz
-        for i in range(len(supports)):
-            support = supports[i] if i < len(supports) else {}
-            support_width = support.get('support_width_cm', 0) / 100.0  # a metros
-            
-            # Guardar cara de apoyo
-            face_info = {
-                'x': current_x,
-                'type': 'support_face',
-                'support_index': i,
-                'width': support_width,
-                'label': support.get('label', f'EJE {i+1}')
-            }
-            coordinates['faces'].append(face_info)
-            
-            # Intervalo de apoyo
-            if support_width > 0:
-                support_interval = {
-                    'start': current_x,
-                    'end': current_x + support_width,
-                    'type': 'support',
-                    'index': i
+        return CoordinatesBundle(
+            # Caras de apoyos
+            faces=[
+                {
+                    'x': face_x,
+                    'type': 'support_face',
+                    'support_index': i,
+                    'width': support_width,
+                    'label': label,
                 }
-                coordinates['supports'].append(support_interval)
-            
-            current_x += support_width
-            
-            # Si hay luz después de este apoyo
-            if i < len(spans):
-                span = spans[i]
-                span_length = span.get('clear_span_between_supports_m', 0)
-                
-                # Centro de la luz
-                center_info = {
-                    'x': current_x + span_length / 2,
+                for i, (face_x, support_width, label) in enumerate(zip(support_x, support_widths, labels))
+            ],
+            # Centros de luces
+            centers=[
+                {
+                    'x': span_start + span_length / 2,
                     'type': 'span_center',
                     'span_index': i,
                     'length': span_length,
                     'height_cm': span.get('section_height_cm', 0),
-                    'base_cm': span.get('section_base_cm', 0)
+                    'base_cm': span.get('section_base_cm', 0),
                 }
-                coordinates['centers'].append(center_info)
-                
-                # Intervalo de luz
-                span_interval = {
-                    'start': current_x,
-                    'end': current_x + span_length,
+                for i, (span, span_start, span_length) in enumerate(zip(spans[:n_pairs], span_x, span_lengths))
+            ],
+            # Intervalos de luces
+            spans=[
+                {
+                    'start': span_start,
+                    'end': span_start + span_length,
                     'type': 'span',
                     'index': i,
-                    'length': span_length
+                    'length': span_length,
                 }
-                coordinates['spans'].append(span_interval)
-                
-                current_x += span_length
-        
-        coordinates['total_length'] = current_x
-        return coordinates
+                for i, (span_start, span_length) in enumerate(zip(span_x, span_lengths))
+            ],
+            # Intervalos de apoyos
+            supports=[
+                {
+                    'start': face_x,
+                    'end': face_x + support_width,
+                    'type': 'support',
+                    'index': i,
+                }
+                for i, (face_x, support_width) in enumerate(zip(support_x, support_widths))
+                if support_width > 0
+            ],
+            total_length=axis['total_length'],
+            mean_span_length=sum(span_lengths) / n_pairs if n_pairs else 0.0,
+            longest_span_index=max(range(n_pairs), key=span_lengths.__getitem__) if n_pairs else -1,
+        )
     
     def _identify_continuous_bars(self, beam_data: Dict) -> Dict:
         """Identifica barras continuas obligatorias según NSR-10 C.21.5.2.1"""
-        top_bars = beam_data.get('top_bars', [])
-        bottom_bars = beam_data.get('bottom_bars', [])
+        top_counter = beam_data.get('top_bars') or Counter()
+        bottom_counter = beam_data.get('bottom_bars') or Counter()
         
-        if not top_bars and not bottom_bars:
+        if not top_counter and not bottom_counter:
             return {'top': {'diameters': [], 'count_per_diameter': {}},
                    'bottom': {'diameters': [], 'count_per_diameter': {}}}
         
-        # Contar diámetros
-        top_counter = Counter(top_bars)
-        bottom_counter = Counter(bottom_bars)
-        
-        # Ordenar diámetros de mayor a menor
-        def get_diameter_num(diam: str) -> int:
-            try:
-                return int(diam.replace('#', ''))
-            except ValueError:
-                return 0
-        
-        top_diameters = sorted(top_counter.keys(), key=get_diameter_num, reverse=True)
-        bottom_diameters = sorted(bottom_counter.keys(), key=get_diameter_num, reverse=True)
-        
         # Seleccionar máximo 2 diámetros más grandes para continuas
-        continuous_top_diameters = top_diameters[:2]
-        continuous_bottom_diameters = bottom_diameters[:2]
+        # (_expand_bar_config solo admite diámetros de _VALID_DIAMETERS)
+        diameter_num = _DIAMETER_NUM.get
+        continuous_top_diameters = heapq.nlargest(2, top_counter, key=diameter_num)
+        continuous_bottom_diameters = heapq.nlargest(2, bottom_counter, key=diameter_num)
         
         # Determinar cuántas de cada diámetro deben ser continuas (mínimo 1, máximo 2)
         top_count_per_diameter = {}
@@ -476,84 +604,106 @@ class BeamDetailingService(SegmentationMixin):
             }
         }
     
-    def _calculate_prohibited_zones(self, coordinates: Dict, beam_data: Dict) -> List[ProhibitedZone]:
+    def _calculate_prohibited_zones(self, coordinates: CoordinatesBundle, beam_data: Dict) -> List[ProhibitedZone]:
         """Calcula zonas donde no se permiten empalmes según NSR-10 C.21.5.3.2"""
-        zones: List[ProhibitedZone] = []
+        # (inicio, orden de inserción, zona): la tupla ordena en C y conserva la estabilidad
+        keyed_zones: List[Tuple[float, int, ProhibitedZone]] = []
         d = beam_data.get('effective_depth_m', 0.5)
-        faces = coordinates.get('faces', [])
-        spans = coordinates.get('spans', [])
+        faces = coordinates.faces
+        spans = coordinates.spans
         total_supports = len(faces)
+        total_length = coordinates.total_length
 
+        # Inicios y fines ordenados para buscar luces por bisección con tolerancia de 1 cm
+        span_starts = sorted((span['start'], index) for index, span in enumerate(spans))
+        span_ends = sorted((span['end'], index) for index, span in enumerate(spans))
+
+        # _calculate_coordinates garantiza todas las claves de caras y luces
         for face in faces:
-            if face.get('type') != 'support_face':
+            if face['type'] != 'support_face':
                 continue
 
-            support_index = face.get('support_index', 0)
-            support_width = face.get('width', 0.0)
-            support_start = face.get('x', 0.0)
+            support_index = face['support_index']
+            support_width = face['width']
+            support_start = face['x']
             support_end = support_start + support_width
             support_half_width = support_width / 2
             prohibited_distance = max(2 * d, support_half_width)
-            label = face.get('label') or f"Eje {support_index + 1}"
+            distance_label = f"{prohibited_distance*100:.0f} cm"
+            label = face['label'] or f"Eje {support_index + 1}"
             is_first = support_index == 0
             is_last = support_index == total_supports - 1
 
             # Zona correspondiente al propio apoyo
             if support_end - support_start > 0:
-                zones.append(
-                    ProhibitedZone(
+                keyed_zones.append((
+                    support_start,
+                    len(keyed_zones),
+                    ProhibitedZone.model_construct(
                         start_m=support_start,
                         end_m=support_end,
                         type='no_splice_zone',
                         description=f"No empalmar dentro del apoyo {label} (ancho {support_width*100:.0f} cm)",
                         support_index=support_index,
-                    )
-                )
+                    ),
+                ))
 
             # Zona posterior (solo si no es el apoyo final)
             if not is_last:
-                right_limit = coordinates.get('total_length', support_end)
-                for span in spans:
-                    if abs(span.get('start', -999) - support_end) < 0.01:
-                        right_limit = min(right_limit, span['start'] + span.get('length', 0) / 2)
-                        break
+                right_limit = support_end if total_length is None else total_length
+                span = self._first_span_near(span_starts, spans, support_end)
+                if span is not None:
+                    right_limit = min(right_limit, span['start'] + span['length'] / 2)
 
                 zone_start = support_end
                 zone_end = min(support_end + prohibited_distance, right_limit)
                 if zone_end > zone_start:
-                    zones.append(
-                        ProhibitedZone(
+                    keyed_zones.append((
+                        zone_start,
+                        len(keyed_zones),
+                        ProhibitedZone.model_construct(
                             start_m=zone_start,
                             end_m=zone_end,
                             type='no_splice_zone',
-                            description=f"No empalmar: {prohibited_distance*100:.0f} cm después de {label}",
+                            description=f"No empalmar: {distance_label} después de {label}",
                             support_index=support_index,
-                        )
-                    )
+                        ),
+                    ))
 
             # Zona anterior (solo si no es el primer apoyo)
             if not is_first:
                 left_limit = 0.0
-                for span in spans:
-                    if abs(span.get('end', -999) - support_start) < 0.01:
-                        left_limit = max(left_limit, span['end'] - span.get('length', 0) / 2)
-                        break
+                span = self._first_span_near(span_ends, spans, support_start)
+                if span is not None:
+                    left_limit = max(left_limit, span['end'] - span['length'] / 2)
 
                 zone_start = max(support_start - prohibited_distance, left_limit)
                 zone_end = support_start
                 if zone_start < zone_end:
-                    zones.append(
-                        ProhibitedZone(
+                    keyed_zones.append((
+                        zone_start,
+                        len(keyed_zones),
+                        ProhibitedZone.model_construct(
                             start_m=zone_start,
                             end_m=zone_end,
                             type='no_splice_zone',
-                            description=f"No empalmar: {prohibited_distance*100:.0f} cm antes de {label}",
+                            description=f"No empalmar: {distance_label} antes de {label}",
                             support_index=support_index,
-                        )
-                    )
+                        ),
+                    ))
+
+        keyed_zones.sort()
+        return [zone for _, _, zone in keyed_zones]
 
-        zones.sort(key=lambda z: z.start_m)
-        return zones
+    @staticmethod
+    def _first_span_near(
+        keyed: List[Tuple[float, int]], spans: List[Dict[str, Any]], position: float
+    ) -> Optional[Dict[str, Any]]:
+        """Primera luz (en orden original) cuya coordenada está a menos de 1 cm de ``position``."""
+        lo = bisect_left(keyed, (position - 0.01,))
+        hi = bisect_right(keyed, (position + 0.01, len(spans)))
+        matches = [index for value, index in keyed[lo:hi] if abs(value - position) < 0.01]
+        return spans[min(matches)] if matches else None
 
     def _assign_segments_to_spans(
         self,
@@ -565,82 +715,107 @@ class BeamDetailingService(SegmentationMixin):
         assigned: List[StirrupSegment] = []
         if not segments:
             return assigned
-        for start, end in segments:
-            for span in coordinate_spans:
-                span_start = span.get('start')
-                span_end = span.get('end')
-                if span_start is None or span_end is None:
-                    continue
-                overlap_start = max(start, span_start)
-                overlap_end = min(end, span_end)
-                if overlap_end - overlap_start <= 0:
-                    continue
-                span_index = span.get('index')
-                if span_index is None:
-                    continue
-                spec = spec_map.get(span_index)
-                if spec is None:
-                    continue
-                spacing = (
-                    spec.spacing_confined_m if zone_type == 'confined' else spec.spacing_non_confined_m
-                )
-                if spacing > 0:
-                    segment_length = overlap_end - overlap_start
-                    estimated_count = max(1, math.floor(segment_length / spacing) + 1)
-                else:
-                    estimated_count = None
-                assigned.append(
-                    StirrupSegment(
-                        start_m=overlap_start,
-                        end_m=overlap_end,
-                        zone_type=zone_type,
-                        spacing_m=spacing,
-                        estimated_count=estimated_count,
-                    )
+        # Solo luces con límites, índice y especificación pueden recibir segmentos
+        usable: List[Tuple[float, float, StirrupSpanSpec]] = []
+        for span in coordinate_spans:
+            span_start = span.get('start')
+            span_end = span.get('end')
+            spec = spec_map.get(span.get('index'))
+            if span_start is None or span_end is None or spec is None:
+                continue
+            usable.append((span_start, span_end, spec))
+        if not usable:
+            return assigned
+
+        segment_bounds = np.asarray(segments, dtype=np.float64).reshape(-1, 2)
+        span_starts = np.fromiter((item[0] for item in usable), np.float64, len(usable))
+        span_ends = np.fromiter((item[1] for item in usable), np.float64, len(usable))
+        spacings = [
+            spec.spacing_confined_m if zone_type == 'confined' else spec.spacing_non_confined_m
+            for _, _, spec in usable
+        ]
+
+        _, span_idx, overlap_starts, overlap_ends, counts = segment_span_overlaps(
+            segment_bounds[:, 0].copy(),
+            segment_bounds[:, 1].copy(),
+            span_starts,
+            span_ends,
+            np.asarray(spacings, dtype=np.float64),
+        )
+        for span_i, overlap_start, overlap_end, estimated_count in zip(
+            span_idx.tolist(), overlap_starts.tolist(), overlap_ends.tolist(), counts.tolist()
+        ):
+            assigned.append(
+                StirrupSegment.model_construct(
+                    start_m=overlap_start,
+                    end_m=overlap_end,
+                    zone_type=zone_type,
+                    spacing_m=spacings[span_i],
+                    estimated_count=estimated_count if estimated_count >= 0 else None,
                 )
+            )
         return assigned
 
     def _build_stirrups_summary(
         self,
         beam_data: Dict[str, Any],
-        coordinates: Dict[str, Any],
+        coordinates: CoordinatesBundle,
         prohibited_zones: List[ProhibitedZone],
         top_bars: List[RebarDetail],
         bottom_bars: List[RebarDetail],
     ) -> Optional[StirrupDesignSummary]:
         span_geometries = beam_data.get('span_geometries') or []
-        coordinate_spans = coordinates.get('spans', [])
+        coordinate_spans = coordinates.spans
         if not span_geometries or not coordinate_spans:
             return None
 
         cover_cm_value = float(beam_data.get('cover_cm') or 0)
-        span_specs: List[StirrupSpanSpec] = []
-        for index, span in enumerate(span_geometries):
-            base_cm = float(span.get('section_base_cm') or 0)
-            height_cm = float(span.get('section_height_cm') or 0)
-            effective_depth = calculate_effective_depth(height_cm, cover_cm_value)
-            span_specs.append(
-                StirrupSpanSpec(
-                    span_index=index,
-                    label=span.get('label') or f"Luz {index + 1}",
-                    base_cm=base_cm,
-                    height_cm=height_cm,
-                    cover_cm=cover_cm_value,
-                    stirrup_width_cm=max(base_cm - 2 * cover_cm_value, 0.0),
-                    stirrup_height_cm=max(height_cm - 2 * cover_cm_value, 0.0),
-                    effective_depth_m=effective_depth,
-                    spacing_confined_m=calculate_spacing_for_zone(effective_depth, 'confined'),
-                    spacing_non_confined_m=calculate_spacing_for_zone(effective_depth, 'non_confined'),
-                )
+        span_count = len(span_geometries)
+        bases_cm = np.fromiter(
+            (float(span.get('section_base_cm') or 0) for span in span_geometries), np.float64, span_count
+        )
+        heights_cm = np.fromiter(
+            (float(span.get('section_height_cm') or 0) for span in span_geometries), np.float64, span_count
+        )
+        # Geometría del estribo y separaciones de todas las luces a la vez
+        effective_depths = calculate_effective_depths(heights_cm, cover_cm_value)
+        stirrup_widths = np.maximum(bases_cm - 2 * cover_cm_value, 0.0)
+        stirrup_heights = np.maximum(heights_cm - 2 * cover_cm_value, 0.0)
+        span_specs: List[StirrupSpanSpec] = [
+            StirrupSpanSpec(
+                span_index=index,
+                label=span.get('label') or f"Luz {index + 1}",
+                base_cm=base_cm,
+                height_cm=height_cm,
+                cover_cm=cover_cm_value,
+                stirrup_width_cm=stirrup_width,
+                stirrup_height_cm=stirrup_height,
+                effective_depth_m=effective_depth,
+                spacing_confined_m=spacing_confined,
+                spacing_non_confined_m=spacing_non_confined,
             )
+            for index, (
+                span, base_cm, height_cm, stirrup_width, stirrup_height,
+                effective_depth, spacing_confined, spacing_non_confined,
+            ) in enumerate(zip(
+                span_geometries,
+                bases_cm.tolist(),
+                heights_cm.tolist(),
+                stirrup_widths.tolist(),
+                stirrup_heights.tolist(),
+                effective_depths.tolist(),
+                calculate_spacings_for_zone(effective_depths, 'confined').tolist(),
+                calculate_spacings_for_zone(effective_depths, 'non_confined').tolist(),
+            ))
+        ]
 
         if not span_specs:
             return None
 
         spec_map = {spec.span_index: spec for spec in span_specs}
-        lap_segments = extract_splice_segments(list(top_bars or []) + list(bottom_bars or []))
+        lap_segments = extract_splice_segments(chain(top_bars or (), bottom_bars or ()))
         confined_segments = derive_confined_segments(prohibited_zones, lap_segments)
-        total_length = float(coordinates.get('total_length') or 0.0)
+        total_length = float(coordinates.total_length or 0.0)
         unconfined_segments = derive_unconfined_segments(total_length, confined_segments)
 
         zone_segments: List[StirrupSegment] = []
@@ -664,90 +839,102 @@ class BeamDetailingService(SegmentationMixin):
             zone_segments=zone_segments,
         )
     
-    def _calculate_development_lengths(self, beam_data: Dict) -> Dict[str, float]:
+    def _calculate_development_lengths(self, beam_data: Dict) -> Mapping[str, Mapping[str, float]]:
         """Calcula longitudes de desarrollo ajustadas según NSR-10 C.12.2"""
-        development_lengths = {}
         concrete_strength = beam_data.get('concrete_strength', '21 MPa (3000 psi)')
         reinforcement = beam_data.get('reinforcement', '420 MPa (Grado 60)')
-        
-        fc_factor = self.fc_factors.get(concrete_strength, 1.0)
-        fy_factor = self.fy_factors.get(reinforcement, 1.0)
-        energy_factor = self.energy_factors.get(beam_data.get('energy_dissipation_class', 'DES'), 1.0)
+        energy_class = beam_data.get('energy_dissipation_class', 'DES')
         lap_lookup = beam_data.get('lap_splice_lookup') or {}
-        fc_column = self.fc_column_map.get(concrete_strength)
-        
-        for diameter, base_length in self.base_development_lengths.items():
-            # Longitud básica ajustada por f'c y fy
-            adjusted_length = base_length * fc_factor * fy_factor
-            
-            # Para empalmes clase B en zonas sísmicas
-            splice_length = adjusted_length * energy_factor
-            if fc_column and diameter in lap_lookup:
-                lap_value = lap_lookup[diameter].get(fc_column)
-                if lap_value:
-                    splice_length = float(lap_value)
-            
-            development_lengths[diameter] = {
-                'development': adjusted_length,
-                'splice': splice_length
-            }
+        fc_column = _FC_COLUMN_MAP.get(concrete_strength)
         
-        return development_lengths
-    
-    def _detail_top_bars(self, beam_data: Dict, coordinates: Dict, 
-                        prohibited_zones: List[ProhibitedZone],
+        # Solo los traslapes tabulados de la columna f'c aplicable afectan el resultado
+        lap_overrides = tuple(
+            (diameter, lap_lookup[diameter].get(fc_column))
+            for diameter in _BASE_DEVELOPMENT_LENGTHS
+            if fc_column and diameter in lap_lookup
+        )
+        return _development_lengths_table(concrete_strength, reinforcement, energy_class, lap_overrides)
+
+    @staticmethod
+    def _diameter_groups(
+        bar_counter: Counter, continuous_per_diameter: Dict[str, int], development_lengths: Dict
+    ) -> List[Tuple[str, int, Mapping[str, float], int]]:
+        """(diámetro, cantidad, longitudes de desarrollo, continuas) en una sola pasada"""
+        development_get = development_lengths.get
+        continuous_get = continuous_per_diameter.get
+        return [
+            (diameter, total_count, development_get(diameter, _DEFAULT_DEVELOPMENT), continuous_get(diameter, 0))
+            for diameter, total_count in bar_counter.items()
+        ]
+
+    @staticmethod
+    def _continuous_bar_template(
+        diameter: str, position: str, total_length: float, hook_type: str, development_length: float
+    ) -> RebarDetail:
+        """Barra continua de extremo a extremo sin id ni empalmes, para copiar por barra"""
+        return RebarDetail.model_construct(
+            id='',
+            diameter=diameter,
+            position=position,
+            type='continuous',
+            length_m=total_length,
+            start_m=0.0,
+            end_m=total_length,
+            splices=None,
+            hook_type=hook_type,
+            quantity=1,
+            development_length_m=development_length,
+            notes="Barra continua - NSR-10 C.21.5.2.1"
+        )
+
+    def _detail_top_bars(self, beam_data: Dict, coordinates: CoordinatesBundle, 
+                        prohibited_zones: List[ProhibitedZone], zones: ZoneIndex,
                         continuous_bars: Dict, development_lengths: Dict) -> List[RebarDetail]:
         """Genera detalle para barras superiores"""
         bars = []
-        top_bars = beam_data.get('top_bars', [])
+        bar_counter = beam_data.get('top_bars') or Counter()
         max_length = beam_data.get('max_bar_length_m', 12.0)
         hook_type = beam_data.get('hook_type', '135')
         edge_cover = beam_data.get('edge_cover_m', self.min_edge_cover_m)
+        total_length = coordinates.total_length
         
-        if not top_bars:
+        if not bar_counter:
             return bars
         
-        # Agrupar por diámetro
-        bar_counter = Counter(top_bars)
-        
-        for diameter, total_count in bar_counter.items():
-            dev_info = development_lengths.get(diameter, {'development': 0.6, 'splice': 0.78})
-            
-            # Determinar cuántas son continuas
-            continuous_count = continuous_bars['top']['count_per_diameter'].get(diameter, 0)
+        groups = self._diameter_groups(
+            bar_counter, continuous_bars['top']['count_per_diameter'], development_lengths
+        )
+        for diameter, total_count, dev_info, continuous_count in groups:
+            # Parámetros de segmentación comunes a todas las barras del diámetro
+            hook_length = self._get_single_hook_length(diameter, hook_type)
+            splice_length = dev_info['splice']
             
-            # Barras continuas
-            for i in range(continuous_count):
-                bar_id = f"T{diameter.replace('#', '')}-C{i+1:02d}"
-                splices = self._calculate_splices(
-                    total_length=coordinates['total_length'],
+            # El plan de empalmes solo depende del diámetro: se calcula una vez
+            base_splices = None
+            if continuous_count > 0:
+                base_splices = self._calculate_splices(
+                    total_length=total_length,
                     max_bar_length=max_length,
                     prohibited_zones=prohibited_zones,
-                    splice_length=dev_info['splice']
-                )
-                
-                bar = RebarDetail(
-                    id=bar_id,
-                    diameter=diameter,
-                    position='top',
-                    type='continuous',
-                    length_m=coordinates['total_length'],
-                    start_m=0.0,
-                    end_m=coordinates['total_length'],
-                    splices=splices,
-                    hook_type=hook_type,
-                    quantity=1,
-                    development_length_m=dev_info['development'],
-                    notes="Barra continua - NSR-10 C.21.5.2.1"
+                    splice_length=splice_length
                 )
+            
+            # Barras continuas: plantilla por diámetro, cada barra solo cambia id y empalmes
+            tag = self._bar_tag('top', diameter)
+            template = self._continuous_bar_template(
+                diameter, 'top', total_length, hook_type, dev_info['development']
+            )
+            for i in range(continuous_count):
+                splices = [dict(splice) for splice in base_splices] if base_splices else None
+                bar = template.model_copy(update={'id': f"{tag}-C{i+1:02d}", 'splices': splices})
                 segments = self._split_bar_by_max_length(
                     bar,
                     max_length=max_length,
-                    splice_length=dev_info['splice'],
-                    prohibited_zones=prohibited_zones,
-                    hook_length=self._get_single_hook_length(diameter, hook_type),
+                    splice_length=splice_length,
+                    zones=zones,
+                    hook_length=hook_length,
                     edge_cover=edge_cover,
-                    beam_length=coordinates['total_length'],
+                    beam_length=total_length,
                     is_bottom_bar=False,
                 )
                 bars.extend(segments)
@@ -768,64 +955,51 @@ class BeamDetailingService(SegmentationMixin):
         
         return bars
     
-    def _detail_bottom_bars(self, beam_data: Dict, coordinates: Dict,
-                           prohibited_zones: List[ProhibitedZone],
+    def _detail_bottom_bars(self, beam_data: Dict, coordinates: CoordinatesBundle,
+                           prohibited_zones: List[ProhibitedZone], zones: ZoneIndex,
                            continuous_bars: Dict, development_lengths: Dict) -> List[RebarDetail]:
         """Genera detalle para barras inferiores"""
         bars = []
-        bottom_bars = beam_data.get('bottom_bars', [])
+        bar_counter = beam_data.get('bottom_bars') or Counter()
         max_length = beam_data.get('max_bar_length_m', 12.0)
         hook_type = beam_data.get('hook_type', '135')
         edge_cover = beam_data.get('edge_cover_m', self.min_edge_cover_m)
+        total_length = coordinates.total_length
         
-        if not bottom_bars:
+        if not bar_counter:
             return bars
         
-        # Agrupar por diámetro
-        bar_counter = Counter(bottom_bars)
-        
-        for diameter, total_count in bar_counter.items():
-            dev_info = development_lengths.get(diameter, {'development': 0.6, 'splice': 0.78})
-            
-            # Determinar cuántas son continuas
-            continuous_count = continuous_bars['bottom']['count_per_diameter'].get(diameter, 0)
+        groups = self._diameter_groups(
+            bar_counter, continuous_bars['bottom']['count_per_diameter'], development_lengths
+        )
+        for diameter, total_count, dev_info, continuous_count in groups:
+            # Parámetros de segmentación comunes a todas las barras del diámetro
+            hook_length = self._get_single_hook_length(diameter, hook_type)
+            splice_length = dev_info['splice']
             
-            # Barras continuas
+            # Barras continuas: plantilla por diámetro, cada barra solo cambia id y empalmes
+            tag = self._bar_tag('bottom', diameter)
+            template = self._continuous_bar_template(
+                diameter, 'bottom', total_length, hook_type, dev_info['development']
+            )
             for i in range(continuous_count):
-                bar_id = f"B{diameter.replace('#', '')}-C{i+1:02d}"
-                total_length = coordinates['total_length']
                 splices = self._build_bottom_splice_plan(
                     total_length=total_length,
-                    splice_length=dev_info['splice'],
+                    splice_length=splice_length,
                     prohibited_zones=prohibited_zones,
                     max_bar_length=max_length,
                     bar_index=i,
                 )
-                offset_ratio_groups = [0.08, 0.16, 0.24]
-                splice_offset_ratio = offset_ratio_groups[i % len(offset_ratio_groups)]
-                
-                bar = RebarDetail(
-                    id=bar_id,
-                    diameter=diameter,
-                    position='bottom',
-                    type='continuous',
-                    length_m=total_length,
-                    start_m=0.0,
-                    end_m=total_length,
-                    splices=splices,
-                    hook_type=hook_type,
-                    quantity=1,
-                    development_length_m=dev_info['development'],
-                    notes="Barra continua - NSR-10 C.21.5.2.1"
-                )
+                splice_offset_ratio = _BOTTOM_OFFSET_RATIOS[i % len(_BOTTOM_OFFSET_RATIOS)]
+                bar = template.model_copy(update={'id': f"{tag}-C{i+1:02d}", 'splices': splices})
                 segments = self._split_bar_by_max_length(
                     bar,
                     max_length=max_length,
-                    splice_length=dev_info['splice'],
-                    prohibited_zones=prohibited_zones,
-                    hook_length=self._get_single_hook_length(diameter, hook_type),
+                    splice_length=splice_length,
+                    zones=zones,
+                    hook_length=hook_length,
                     edge_cover=edge_cover,
-                    beam_length=coordinates['total_length'],
+                    beam_length=total_length,
                     prefer_previous_zone=True,
                     splice_offset_ratio=splice_offset_ratio,
                     is_bottom_bar=True,
@@ -879,35 +1053,15 @@ class BeamDetailingService(SegmentationMixin):
         if num_pieces <= 1:
             return None
         
-        piece_length = total_length / num_pieces
-        splices = []
-        
-        # Buscar ubicaciones seguras para empalmes
-        for i in range(1, num_pieces):
-            splice_center = i * piece_length
-            
-            # Verificar que no esté en zona prohibida
-            in_prohibited = False
-            for zone in prohibited_zones:
-                if zone.start_m <= splice_center <= zone.end_m:
-                    in_prohibited = True
-                    break
-            
-            if not in_prohibited:
-                splice_start = splice_center - splice_length / 2
-                splice_end = splice_center + splice_length / 2
-                
-                # Asegurar que el empalme no salga de la viga
-                splice_start = max(0, splice_start)
-                splice_end = min(total_length, splice_end)
-                
-                if splice_end - splice_start >= splice_length * 0.8:  # Al menos 80% de la longitud requerida
-                    splices.append({
-                        'start': splice_start,
-                        'end': splice_end,
-                        'length': splice_end - splice_start,
-                        'type': 'lap_splice_class_b'
-                    })
+        # Núcleo vectorizado sobre arreglos de zonas
+        zone_starts, zone_ends = zone_bounds(prohibited_zones)
+        starts, ends = splice_positions(
+            float(total_length), float(max_bar_length), float(splice_length), zone_starts, zone_ends
+        )
+        splices = [
+            lap_splice(splice_start, splice_end)
+            for splice_start, splice_end in zip(starts.tolist(), ends.tolist())
+        ]
         
         return splices if splices else None
 
@@ -924,35 +1078,18 @@ class BeamDetailingService(SegmentationMixin):
         if splice_length <= 0:
             return None
 
-        possible_positions = [0.25, 0.33, 0.40, 0.50, 0.60, 0.67, 0.75]
-        pattern_map = {
-            0: [1, 5],  # 33% y 67%
-            1: [2, 4],  # 40% y 60%
-            2: [0, 3],  # 25% y 50%
-        }
-        group = bar_index % len(pattern_map)
-        indices = pattern_map[group]
-        splices: List[Dict[str, Any]] = []
+        group = bar_index % len(_BOTTOM_SPLICE_RATIOS)
+        centers = _BOTTOM_SPLICE_RATIOS[group] * total_length
+        zone_starts, zone_ends = zone_bounds(prohibited_zones)
+        blocked = splice_conflicts(centers, splice_length, zone_starts, zone_ends)
 
-        for idx in indices:
-            if idx >= len(possible_positions):
-                continue
-            center_ratio = possible_positions[idx]
-            center = total_length * center_ratio
-            if self._is_in_prohibited_zone(center, prohibited_zones, splice_length):
-                continue
-            splice_start = max(0.0, center - splice_length / 2)
-            splice_end = min(total_length, center + splice_length / 2)
-            if splice_end - splice_start >= splice_length * 0.8:
-                splices.append(
-                    {
-                        "start": splice_start,
-                        "end": splice_end,
-                        "length": splice_end - splice_start,
-                        "type": "lap_splice_class_b",
-                        "offset_group": group,
-                    }
-                )
+        splice_starts = np.maximum(0.0, centers - splice_length / 2)
+        splice_ends = np.minimum(total_length, centers + splice_length / 2)
+        keep = ~blocked & (splice_ends - splice_starts >= splice_length * 0.8)
+        splices = [
+            lap_splice(splice_start, splice_end, offset_group=group)
+            for splice_start, splice_end in zip(splice_starts[keep].tolist(), splice_ends[keep].tolist())
+        ]
 
         if splices:
             return splices
@@ -988,74 +1125,49 @@ class BeamDetailingService(SegmentationMixin):
         bounded_offset_factor = max(-0.5, min(offset_factor, 0.5))
         offset_per_joint = base_piece_length * bounded_offset_factor
 
-        splices: List[Dict[str, Any]] = []
-        for i in range(1, num_pieces):
-            splice_center = i * base_piece_length + offset_per_joint * i
-            splice_center = max(splice_length / 2, min(splice_center, total_length - splice_length / 2))
-
-            if self._is_in_prohibited_zone(splice_center, prohibited_zones, splice_length):
-                continue
+        # Centros candidatos y prueba contra todas las zonas en una sola operación
+        joints = np.arange(1, num_pieces, dtype=np.float64)
+        centers = joints * base_piece_length + offset_per_joint * joints
+        centers = np.maximum(splice_length / 2, np.minimum(centers, total_length - splice_length / 2))
+        zone_starts, zone_ends = zone_bounds(prohibited_zones)
+        blocked = splice_conflicts(centers, splice_length, zone_starts, zone_ends)
 
-            splice_start = max(0.0, splice_center - splice_length / 2)
-            splice_end = min(total_length, splice_center + splice_length / 2)
-            if splice_end - splice_start >= splice_length * 0.8:
-                splices.append(
-                    {
-                        "start": splice_start,
-                        "end": splice_end,
-                        "length": splice_end - splice_start,
-                        "type": "lap_splice_class_b",
-                        "offset_applied": round(bounded_offset_factor, 3),
-                    }
-                )
+        # Recorte a la viga y filtro del 80% sobre todos los candidatos a la vez
+        splice_starts = np.maximum(0.0, centers - splice_length / 2)
+        splice_ends = np.minimum(total_length, centers + splice_length / 2)
+        keep = ~blocked & (splice_ends - splice_starts >= splice_length * 0.8)
 
+        offset_applied = round(bounded_offset_factor, 3)
+        splices = [
+            lap_splice(splice_start, splice_end, offset_applied=offset_applied)
+            for splice_start, splice_end in zip(splice_starts[keep].tolist(), splice_ends[keep].tolist())
+        ]
         return splices if splices else None
 
     @staticmethod
-    def _is_in_prohibited_zone(
-        position: float,
-        prohibited_zones: List[ProhibitedZone],
-        splice_length: float,
-    ) -> bool:
-        splice_start = position - splice_length / 2
-        splice_end = position + splice_length / 2
-        for zone in prohibited_zones:
-            if zone.start_m <= position <= zone.end_m:
-                return True
-            if splice_start < zone.end_m and splice_end > zone.start_m:
-                return True
-        return False
-
+    def _bar_tag(position: str, diameter: str) -> str:
+        """Prefijo de identificador de barra: cara ('T'/'B') y número de diámetro"""
+        return f"{'T' if position == 'top' else 'B'}{diameter.replace('#', '')}"
     
-    def _distribute_support_bars(self, diameter: str, count: int, coordinates: Dict,
+    def _distribute_support_bars(self, diameter: str, count: int, coordinates: CoordinatesBundle,
                                 position: str, hook_type: str, 
                                 development_length: float) -> List[RebarDetail]:
         """Distribuye barras de apoyo en los extremos"""
-        bars = []
-        total_spans = len(coordinates.get('spans', []))
-        
-        if total_spans == 0:
-            return bars
+        if not coordinates.spans:
+            return []
         
         # Longitud típica de barra de apoyo (25% de la luz promedio + desarrollo)
-        avg_span_length = sum(span['length'] for span in coordinates['spans']) / total_spans
-        support_bar_length = avg_span_length * 0.25 + development_length
+        support_bar_length = coordinates.mean_span_length * 0.25 + development_length
+        # Alternar entre apoyos izquierdo y derecho
+        sides = (
+            (0, support_bar_length, "Apoyo izquierdo"),
+            (coordinates.total_length - support_bar_length, coordinates.total_length, "Apoyo derecho"),
+        )
+        tag = self._bar_tag(position, diameter)
         
-        for i in range(count):
-            bar_id = f"{'T' if position == 'top' else 'B'}{diameter.replace('#', '')}-A{i+1:02d}"
-            
-            # Alternar entre apoyos izquierdo y derecho
-            if i % 2 == 0:
-                start = 0
-                end = support_bar_length
-                notes = "Apoyo izquierdo"
-            else:
-                start = coordinates['total_length'] - support_bar_length
-                end = coordinates['total_length']
-                notes = "Apoyo derecho"
-            
-            bar = RebarDetail(
-                id=bar_id,
+        return [
+            RebarDetail.model_construct(
+                id=f"{tag}-A{i+1:02d}",
                 diameter=diameter,
                 position=position,
                 type='support',
@@ -1068,16 +1180,16 @@ class BeamDetailingService(SegmentationMixin):
                 development_length_m=development_length,
                 notes=notes
             )
-            bars.append(bar)
-        
-        return bars
+            for i in range(count)
+            for start, end, notes in (sides[i % 2],)
+        ]
     
-    def _distribute_span_bars(self, diameter: str, count: int, coordinates: Dict,
+    def _distribute_span_bars(self, diameter: str, count: int, coordinates: CoordinatesBundle,
                              position: str, hook_type: str, 
                              development_length: float, bar_type: str) -> List[RebarDetail]:
         """Distribuye barras en luces"""
         bars = []
-        spans = coordinates.get('spans', [])
+        spans = coordinates.spans
         
         if not spans:
             return bars
@@ -1085,11 +1197,12 @@ class BeamDetailingService(SegmentationMixin):
         # Para barras que entran al apoyo
         if bar_type == 'support_anchored':
             bar_length = spans[0]['length'] * 0.8  # 80% de la primera luz
+            tag = self._bar_tag(position, diameter)
             
             for i in range(min(count, 2)):  # Máximo 2 barras por configuración
-                bar_id = f"{'T' if position == 'top' else 'B'}{diameter.replace('#', '')}-S{i+1:02d}"
+                bar_id = f"{tag}-S{i+1:02d}"
                 
-                bar = RebarDetail(
+                bar = RebarDetail.model_construct(
                     id=bar_id,
                     diameter=diameter,
                     position=position,
@@ -1109,7 +1222,7 @@ class BeamDetailingService(SegmentationMixin):
             remaining = count - len(bars)
             if remaining > 0:
                 mid_span_bars = self._create_mid_span_bars(
-                    diameter, remaining, spans, position, 
+                    diameter, remaining, coordinates, position, 
                     hook_type, development_length
                 )
                 bars.extend(mid_span_bars)
@@ -1117,31 +1230,27 @@ class BeamDetailingService(SegmentationMixin):
         # Para barras de luz (no ancladas)
         else:
             mid_span_bars = self._create_mid_span_bars(
-                diameter, count, spans, position, 
+                diameter, count, coordinates, position, 
                 hook_type, development_length
             )
             bars.extend(mid_span_bars)
         
         return bars
     
-    def _create_mid_span_bars(self, diameter: str, count: int, spans: List[Dict],
+    def _create_mid_span_bars(self, diameter: str, count: int, coordinates: CoordinatesBundle,
                              position: str, hook_type: str, 
                              development_length: float) -> List[RebarDetail]:
         """Crea barras para centros de luz"""
-        bars = []
-        
         # Usar la luz más larga para las barras
-        longest_span = max(spans, key=lambda x: x['length'])
+        longest_span = coordinates.spans[coordinates.longest_span_index]
         bar_length = longest_span['length'] * 0.6  # 60% de la luz
+        # Centrar en la luz
+        start = longest_span['start'] + (longest_span['length'] - bar_length) / 2
+        tag = self._bar_tag(position, diameter)
         
-        for i in range(count):
-            bar_id = f"{'T' if position == 'top' else 'B'}{diameter.replace('#', '')}-M{i+1:02d}"
-            
-            # Centrar en la luz
-            start = longest_span['start'] + (longest_span['length'] - bar_length) / 2
-            
-            bar = RebarDetail(
-                id=bar_id,
+        return [
+            RebarDetail.model_construct(
+                id=f"{tag}-M{i+1:02d}",
                 diameter=diameter,
                 position=position,
                 type='span',
@@ -1154,12 +1263,11 @@ class BeamDetailingService(SegmentationMixin):
                 development_length_m=development_length,
                 notes="Centro de luz"
             )
-            bars.append(bar)
-        
-        return bars
+            for i in range(count)
+        ]
     
     def _apply_segment_reinforcement(self, beam_data: Dict, top_bars: List[RebarDetail],
-                                    bottom_bars: List[RebarDetail], coordinates: Dict):
+                                    bottom_bars: List[RebarDetail], coordinates: CoordinatesBundle):
         """Aplica refuerzo adicional para segmentos específicos"""
         segment_reinforcements = beam_data.get('segment_reinforcements', [])
         
@@ -1184,22 +1292,24 @@ class BeamDetailingService(SegmentationMixin):
     
     def _add_segment_bars(self, span_indexes: List[int], quantity: int, 
                          diameter: str, position: str, 
-                         coordinates: Dict, bars_list: List[RebarDetail]):
+                         coordinates: CoordinatesBundle, bars_list: List[RebarDetail]):
         """Agrega barras para segmentos específicos"""
-        spans = coordinates.get('spans', [])
+        spans = coordinates.spans
+        dev_len = _BASE_DEVELOPMENT_LENGTHS.get(diameter, 0.6)
+        tag = self._bar_tag(position, diameter)
         
         for span_idx in span_indexes:
             if 0 <= span_idx < len(spans):
                 span = spans[span_idx]
+                # Barra que cubre todo el segmento: misma geometría para toda la luz
+                bar_length = span['length'] * 0.9  # 90% del segmento
+                start = span['start'] + span['length'] * 0.05  # Centrado
+                notes = f"Refuerzo segmento {span_idx+1}"
                 
                 for i in range(quantity):
-                    bar_id = f"{'T' if position == 'top' else 'B'}{diameter.replace('#', '')}-E{span_idx+1}-{i+1:02d}"
-                    
-                    # Barra que cubre todo el segmento
-                    bar_length = span['length'] * 0.9  # 90% del segmento
-                    start = span['start'] + span['length'] * 0.05  # Centrado
+                    bar_id = f"{tag}-E{span_idx+1}-{i+1:02d}"
                     
-                    bar = RebarDetail(
+                    bar = RebarDetail.model_construct(
                         id=bar_id,
                         diameter=diameter,
                         position=position,
@@ -1207,24 +1317,16 @@ class BeamDetailingService(SegmentationMixin):
                         length_m=bar_length,
                         start_m=start,
                         end_m=start + bar_length,
-                        hook_type='135',
+                        hook_type=HookType.H135,
                         splices=None,
                         quantity=1,
-                        development_length_m=self.base_development_lengths.get(diameter, 0.6),
-                        notes=f"Refuerzo segmento {span_idx+1}"
+                        development_length_m=dev_len,
+                        notes=notes
                     )
                     bars_list.append(bar)
 
     def _get_single_hook_length(self, diameter: str, hook_type: Optional[str]) -> float:
-        if not hook_type:
-            return 0.0
-        hook_lengths = self.hook_length_table.get(diameter)
-        if not hook_lengths:
-            return 0.0
-        length = hook_lengths.get(hook_type)
-        if not length:
-            return 0.0
-        return float(length)
+        return _HOOK_LOOKUP.get((diameter, hook_type), 0.0)
 
     def _apply_cover_and_hook_adjustments(
         self,
@@ -1241,71 +1343,112 @@ class BeamDetailingService(SegmentationMixin):
         tolerance = 1e-3
         max_length = max(max_bar_length or 0.0, 0.0)
 
-        for bar in bars:
-            original_start = bar.start_m
-            original_end = bar.end_m
+        count = len(bars)
+        original_starts = np.fromiter((bar.start_m for bar in bars), np.float64, count)
+        original_ends = np.fromiter((bar.end_m for bar in bars), np.float64, count)
+        # Misma búsqueda que _get_single_hook_length, sin una llamada a método por barra
+        hook_get = _HOOK_LOOKUP.get
+        hook_lengths = np.fromiter(
+            (hook_get((bar.diameter, bar.hook_type), 0.0) for bar in bars),
+            np.float64,
+            count,
+        )
+
+        clamped_starts = np.maximum(cover, np.minimum(original_starts, max_end))
+        clamped_ends = np.maximum(cover, np.minimum(original_ends, max_end))
+        swap = clamped_ends < clamped_starts
+        starts = np.where(swap, clamped_ends, clamped_starts)
+        ends = np.where(swap, clamped_starts, clamped_ends)
+        straight_lengths = np.maximum(ends - starts, 0.0)
+
+        has_hook = hook_lengths != 0.0
+        start_hooks = np.where(has_hook & (original_starts <= cover + tolerance), hook_lengths, 0.0)
+        end_hooks = np.where(
+            has_hook & (original_ends >= total_length - cover - tolerance), hook_lengths, 0.0
+        )
+        totals = straight_lengths + start_hooks + end_hooks
+
+        exceeded = np.zeros(count, dtype=np.bool_)
+        if max_length > 0:
+            # Trim the straight portion so hooks do not push the bar beyond stock limits
+            allowed_straight = np.maximum(max_length - (start_hooks + end_hooks), 0.0)
+            trim = (totals > max_length + tolerance) & (allowed_straight + tolerance < straight_lengths)
+            ends = np.where(trim, starts + allowed_straight, ends)
+            straight_lengths = np.where(trim, np.maximum(ends - starts, 0.0), straight_lengths)
+            totals = np.where(trim, straight_lengths + start_hooks + end_hooks, totals)
+            exceeded = totals > max_length + tolerance
 
-            start = max(cover, min(original_start, max_end))
-            end = max(cover, min(original_end, max_end))
-            if end < start:
-                start, end = end, start
+        # Solo las barras excedidas se recorren para advertir, y solo si el nivel lo emite
+        if exceeded.any() and logger.isEnabledFor(logging.WARNING):
+            for idx in np.flatnonzero(exceeded).tolist():
+                logger.warning(
+                    "La barra %s requiere %.2fm (incluyendo ganchos) y excede la longitud máxima %.2fm",
+                    bars[idx].id,
+                    float(totals[idx]),
+                    max_length,
+                )
+        lengths = np.where(exceeded, max_length, totals)
 
+        for bar, start, end, start_hook, end_hook, length in zip(
+            bars,
+            starts.tolist(),
+            ends.tolist(),
+            start_hooks.tolist(),
+            end_hooks.tolist(),
+            lengths.tolist(),
+        ):
             bar.start_m = start
             bar.end_m = end
-            straight_length = max(end - start, 0.0)
-
-            hook_length = self._get_single_hook_length(bar.diameter, bar.hook_type)
-            start_hook = hook_length if hook_length and original_start <= cover + tolerance else 0.0
-            end_hook = hook_length if hook_length and original_end >= total_length - cover - tolerance else 0.0
-            total_with_hooks = straight_length + start_hook + end_hook
-
-            bar.start_hook_m = float(start_hook)
-            bar.end_hook_m = float(end_hook)
-
-            if max_length > 0 and total_with_hooks > max_length + tolerance:
-                # Trim the straight portion so hooks do not push the bar beyond stock limits
-                allowed_straight = max(max_length - (start_hook + end_hook), 0.0)
-                if allowed_straight + tolerance < straight_length:
-                    bar.end_m = bar.start_m + allowed_straight
-                    straight_length = max(bar.end_m - bar.start_m, 0.0)
-                    total_with_hooks = straight_length + start_hook + end_hook
-
-                if total_with_hooks > max_length + tolerance:
-                    logger.warning(
-                        "La barra %s requiere %.2fm (incluyendo ganchos) y excede la longitud máxima %.2fm",
-                        bar.id,
-                        total_with_hooks,
-                        max_length,
-                    )
-                    total_with_hooks = max_length
-
-            bar.length_m = total_with_hooks
+            bar.start_hook_m = start_hook
+            bar.end_hook_m = end_hook
+            bar.length_m = length
     
-    def _generate_material_list(self, all_bars: List[RebarDetail], 
-                               beam_data: Dict) -> List[MaterialItem]:
-        """Genera lista de materiales optimizada"""
-        # Agrupar por diámetro
-        by_diameter = defaultdict(list)
-        for bar in all_bars:
-            by_diameter[bar.diameter].append(bar)
-        
+    def _generate_material_list(self, batch: RebarBatch,
+                               beam_data: Dict) -> Tuple[List[MaterialItem], float]:
+        """Genera lista de materiales optimizada y su peso total (suma de pesos redondeados)"""
         material_list = []
+        list_weight = 0
+        if not batch.bars:
+            return material_list, list_weight
         max_length = beam_data.get('max_bar_length_m', 12.0)
+        rebar_weights_get = _REBAR_WEIGHTS.get
+
+        # Grupo por diámetro en orden de aparición, en una sola pasada
+        diameter_index: Dict[str, int] = {}
+        group_idx = np.fromiter(
+            (diameter_index.setdefault(diameter, len(diameter_index)) for diameter in batch.diameters),
+            np.intp,
+            len(batch.diameters),
+        )
+        diameters = list(diameter_index)
+        # Orden estable por grupo: cada diámetro queda como un tramo contiguo
+        order = np.argsort(group_idx, kind='stable').tolist()
+        group_ends = np.cumsum(np.bincount(group_idx)).tolist()
+
+        # Totales por diámetro con NumPy: np.add.at acumula en orden, igual que sum()
+        quantities = batch.quantities
+        total_lengths = np.zeros(len(diameters), dtype=np.float64)
+        np.add.at(total_lengths, group_idx, batch.lengths * quantities)
+        total_pieces_by_diameter = np.zeros(len(diameters), dtype=np.int64)
+        np.add.at(total_pieces_by_diameter, group_idx, quantities)
+        weights_per_m = np.fromiter(
+            (rebar_weights_get(diameter, 0.0) for diameter in diameters), np.float64, len(diameters)
+        )
+        total_weights = total_lengths * weights_per_m
         
-        for diameter, bars in by_diameter.items():
-            # Calcular longitudes totales
-            total_length = sum(bar.length_m * bar.quantity for bar in bars)
-            total_pieces = sum(bar.quantity for bar in bars)
+        group_start = 0
+        for idx, (diameter, group_end) in enumerate(zip(diameters, group_ends)):
+            bars = [batch.bars[bar_idx] for bar_idx in order[group_start:group_end]]
+            group_start = group_end
+            total_length = float(total_lengths[idx])
+            total_pieces = int(total_pieces_by_diameter[idx])
+            total_weight = float(total_weights[idx])
             
             # Optimizar cortes
             commercial_lengths = self._optimize_cutting_stock(
                 diameter, bars, max_length
             )
             
-            # Calcular peso
-            weight_per_m = self.rebar_weights.get(diameter, 0.0)
-            total_weight = total_length * weight_per_m
-            
             # Calcular desperdicio
             total_commercial_length = sum(
                 cut['num_bars'] * cut['commercial_length'] 
@@ -1325,48 +1468,84 @@ class BeamDetailingService(SegmentationMixin):
                 waste_percentage=round(waste_percentage, 1)
             )
             material_list.append(item)
+            list_weight += item.weight_kg
         
-        return material_list
+        return material_list, list_weight
     
     def _optimize_cutting_stock(self, diameter: str, bars: List[RebarDetail], 
                                max_length: float) -> List[Dict[str, Any]]:
         """Algoritmo simplificado de cutting stock"""
-        # Extraer longitudes y cantidades
-        length_counts = []
+        # Demanda agrupada por longitud: las barras repetidas comparten cubeta
+        demand: Counter = Counter()
         for bar in bars:
-            for _ in range(bar.quantity):
-                length_counts.append(bar.length_m)
+            if bar.quantity > 0:
+                demand[bar.length_m] += bar.quantity
         
-        if not length_counts:
+        if not demand:
             return []
         
-        # Ordenar de mayor a menor
-        length_counts.sort(reverse=True)
+        # Longitudes únicas de mayor a menor; la tupla no se recorta, se saltan las agotadas
+        lengths = tuple(sorted(demand, reverse=True))
+        head = 0
+        length_count = len(lengths)
+        # Claves negadas: orden ascendente para bisecar sobre la tupla descendente
+        descending_key = [-length for length in lengths]
+        pending = sum(demand.values())
+
+        # Caso frecuente: todas las piezas tienen la misma longitud
+        if len(lengths) == 1:
+            return self._uniform_cutting_plan(lengths[0], pending, max_length)
         
-        cuts = []
-        remaining = length_counts.copy()
+        # Patrones de corte agrupados: una entrada por patrón con num_bars acumulado
+        patterns: Dict[Tuple[float, Tuple[float, ...]], Dict[str, Any]] = {}
+
+        def register(entry: Dict[str, Any]) -> None:
+            key = (entry['commercial_length'], tuple(entry['cut_lengths']))
+            existing = patterns.get(key)
+            if existing is None:
+                patterns[key] = entry
+            else:
+                existing['num_bars'] += entry['num_bars']
         
-        while remaining:
+        while pending:
             current_bar = max_length
             current_cuts = []
+            takes: List[Tuple[float, int, int]] = []
             
-            i = 0
-            while i < len(remaining):
-                if remaining[i] <= current_bar:
-                    current_cuts.append(remaining[i])
-                    current_bar -= remaining[i]
-                    remaining.pop(i)
-                else:
-                    i += 1
+            idx = head
+            while True:
+                # Mejor ajuste: la pieza más larga que aún cabe en el sobrante
+                idx = max(idx, bisect_left(descending_key, -current_bar))
+                if idx >= length_count:
+                    break
+                length = lengths[idx]
+                idx += 1
+                count = demand[length]
+                if not count:
+                    continue
+                taken = 0
+                while taken < count and length <= current_bar:
+                    current_cuts.append(length)
+                    current_bar -= length
+                    taken += 1
+                if taken:
+                    takes.append((length, count, taken))
             
             if current_cuts:
+                # El mismo patrón se repite mientras cada longitud tenga demanda para llenarlo
+                stocks = min(count // taken for _, count, taken in takes)
+                for length, count, taken in takes:
+                    demand[length] = count - taken * stocks
+                    pending -= taken * stocks
+                while head < length_count and not demand[lengths[head]]:
+                    head += 1
                 waste = max_length - sum(current_cuts)
                 efficiency = (sum(current_cuts) / max_length) * 100 if max_length > 0 else 0
                 
-                cuts.append({
+                register({
                     'commercial_length': max_length,
                     'cut_lengths': current_cuts,
-                    'num_bars': 1,
+                    'num_bars': stocks,
                     'waste_m': waste,
                     'efficiency': efficiency
                 })
@@ -1374,8 +1553,12 @@ class BeamDetailingService(SegmentationMixin):
 
             # Si ninguna barra cabe en la longitud comercial disponible,
             # registrar la barra más larga como pieza individual para evitar bucles infinitos.
-            long_bar = remaining.pop(0)
-            cuts.append({
+            long_bar = lengths[head]
+            demand[long_bar] -= 1
+            pending -= 1
+            while head < length_count and not demand[lengths[head]]:
+                head += 1
+            register({
                 'commercial_length': max(long_bar, max_length),
                 'cut_lengths': [long_bar],
                 'num_bars': 1,
@@ -1383,60 +1566,105 @@ class BeamDetailingService(SegmentationMixin):
                 'efficiency': 100 if long_bar >= max_length else (long_bar / max_length) * 100
             })
         
-        return cuts
+        return list(patterns.values())
+    
+    @staticmethod
+    def _uniform_cutting_plan(length: float, pieces: int, max_length: float) -> List[Dict[str, Any]]:
+        """Plan de cortes directo cuando todas las piezas comparten longitud"""
+        # Simular una sola barra comercial para reproducir el mismo redondeo del caso general
+        per_stock = 0
+        current_bar = max_length
+        while per_stock < pieces and length <= current_bar:
+            current_bar -= length
+            per_stock += 1
+
+        if per_stock == 0:
+            return [{
+                'commercial_length': max(length, max_length),
+                'cut_lengths': [length],
+                'num_bars': pieces,
+                'waste_m': max(max_length - length, 0),
+                'efficiency': 100 if length >= max_length else (length / max_length) * 100
+            }]
+
+        full_stocks, leftover = divmod(pieces, per_stock)
+        plan = []
+        for cuts_per_bar, num_bars in ((per_stock, full_stocks), (leftover, 1)):
+            if not cuts_per_bar:
+                continue
+            cut_lengths = [length] * cuts_per_bar
+            used = sum(cut_lengths)
+            plan.append({
+                'commercial_length': max_length,
+                'cut_lengths': cut_lengths,
+                'num_bars': num_bars,
+                'waste_m': max_length - used,
+                'efficiency': (used / max_length) * 100 if max_length > 0 else 0
+            })
+        return plan
     
-    def _validate_nsr10(self, beam_data: Dict, top_bars: List[RebarDetail],
-                       bottom_bars: List[RebarDetail], prohibited_zones: List[ProhibitedZone],
+    def _validate_nsr10(self, beam_data: Dict, batch: RebarBatch,
+                       prohibited_zones: List[ProhibitedZone],
                        continuous_bars: Dict) -> List[str]:
         """Realiza validaciones NSR-10 y retorna advertencias"""
         warnings: List[str] = []
+        warn = warnings.append
+        all_bars = batch.bars
+        split = batch.top_count
 
-        top_continuous = sum(1 for bar in top_bars if bar.type == 'continuous')
-        bottom_continuous = sum(1 for bar in bottom_bars if bar.type == 'continuous')
+        top_continuous = int(np.count_nonzero(batch.continuous[:split]))
+        bottom_continuous = int(np.count_nonzero(batch.continuous[split:]))
 
         if top_continuous < 2:
-            warnings.append("NSR-10 C.21.5.2.1: Mínimo 2 barras superiores continuas requeridas")
+            warn("NSR-10 C.21.5.2.1: Mínimo 2 barras superiores continuas requeridas")
         if bottom_continuous < 2:
-            warnings.append("NSR-10 C.21.5.2.1: Mínimo 2 barras inferiores continuas requeridas")
+            warn("NSR-10 C.21.5.2.1: Mínimo 2 barras inferiores continuas requeridas")
 
         # 2. Empalmes fuera de zonas prohibidas
-        for bar in top_bars + bottom_bars:
-            if not bar.splices:
+        zone_starts = np.fromiter((zone.start_m for zone in prohibited_zones), np.float64, len(prohibited_zones))
+        zone_ends = np.fromiter((zone.end_m for zone in prohibited_zones), np.float64, len(prohibited_zones))
+        for bar in all_bars:
+            if not bar.splices or not prohibited_zones:
                 continue
-            for splice in bar.splices:
-                zone = self._find_overlapping_zone(splice['start'], splice['end'], prohibited_zones)
-                if zone:
-                    warnings.append(
-                        f"Barra {bar.id}: Empalme en zona prohibida ({zone.start_m:.2f}-{zone.end_m:.2f}m)"
-                    )
-                    break
+            splice_starts = np.fromiter((splice['start'] for splice in bar.splices), np.float64, len(bar.splices))
+            splice_ends = np.fromiter((splice['end'] for splice in bar.splices), np.float64, len(bar.splices))
+            # Matriz empalmes x zonas: max(inicio) < min(fin)
+            overlaps = intervals_overlap(splice_starts[:, None], splice_ends[:, None], zone_starts, zone_ends)
+            hits = np.flatnonzero(overlaps.any(axis=1))
+            if hits.size:
+                zone = prohibited_zones[int(overlaps[hits[0]].argmax())]
+                warn(
+                    f"Barra {bar.id}: Empalme en zona prohibida ({zone.start_m:.2f}-{zone.end_m:.2f}m)"
+                )
         
         # 3. Verificar longitudes de desarrollo
-        for bar in top_bars + bottom_bars:
-            if bar.development_length_m and bar.length_m < bar.development_length_m:
-                warnings.append(
-                    f"Barra {bar.id}: Longitud insuficiente para desarrollo "
-                    f"(necesita {bar.development_length_m:.2f}m, tiene {bar.length_m:.2f}m)"
-                )
+        development = batch.development
+        for idx in np.flatnonzero((development != 0.0) & (batch.lengths < development)).tolist():
+            bar = all_bars[idx]
+            warn(
+                f"Barra {bar.id}: Longitud insuficiente para desarrollo "
+                f"(necesita {bar.development_length_m:.2f}m, tiene {bar.length_m:.2f}m)"
+            )
         
         # 4. Verificar clase de disipación de energía
         energy_class = beam_data.get('energy_dissipation_class', 'DES')
         if energy_class == 'DES':
             # Validar ganchos para alta disipación
-            for bar in top_bars + bottom_bars:
-                if bar.type == 'continuous' and bar.hook_type not in ['135', '180']:
-                    warnings.append(
+            for idx in np.flatnonzero(batch.continuous).tolist():
+                bar = all_bars[idx]
+                if bar.hook_type not in _DES_VALID_HOOKS:
+                    warn(
                         f"Barra {bar.id}: En DES se recomiendan ganchos de 135° o 180° "
                         f"(actual: {bar.hook_type}°)"
                     )
         
         # 5. Verificar relación de cantidades
-        total_top = sum(bar.quantity for bar in top_bars)
-        total_bottom = sum(bar.quantity for bar in bottom_bars)
+        total_top = int(batch.quantities[:split].sum())
+        total_bottom = int(batch.quantities[split:].sum())
         
         if total_top == 0:
-            warnings.append("No se definieron barras superiores")
+            warn("No se definieron barras superiores")
         if total_bottom == 0:
-            warnings.append("No se definieron barras inferiores")
+            warn("No se definieron barras inferiores")
         
-        return warnings
\ No newline at end of file
+        return warnings
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import multiprocessing
+import os
 import re
+import shutil
+import threading
+import time
 import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Literal, Optional
+from typing import Literal, Sequence
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session, selectinload
 
 from app import models
@@ -32,7 +42,25 @@ logger.propagate = False
 DOWNLOAD_ROOT = Path.home() / "Downloads" / "Despieces"
 DOWNLOAD_ROOT.mkdir(parents=True, exist_ok=True)
 _RETENTION_DAYS = 14
+# Artefactos ya renderizados, direccionados por contenido (ver _export_cache_key).
+# Fuera de DOWNLOAD_ROOT para no mezclarlos con las descargas del usuario; se
+# eliminan tras _RETENTION_DAYS sin uso, igual que las exportaciones.
+_CACHE_DIR = Path.home() / ".cache" / "despieces" / "exports"
+_CACHE_PRUNE_INTERVAL_S = 3600.0
+_last_cache_prune = 0.0
+# Subir al cambiar plantillas o exportadores para invalidar la caché
+_CACHE_VERSION = "2"
 _SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_-]+")
+# Pool de procesos para los jobs: se crea con el primer envío (ver submit_export_job)
+_EXPORT_WORKERS = min(4, os.cpu_count() or 1)
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_FORMAT_EXTENSIONS = {
+    "dwg": "dwg",
+    "dxf": "dxf",
+    "pdf": "pdf",
+    "svg": "svg",
+}
 
 
 @dataclass(slots=True)
@@ -54,7 +82,7 @@ def prepare_destination_dir(project_name: str | None) -> Path:
 
 
 def build_export_filename(beam_label: str | None, draw_format: str) -> str:
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     slug = _slugify(beam_label or "viga")
     extension = _format_extension(draw_format)
     return f"{slug}_{timestamp}.{extension}"
@@ -63,7 +91,10 @@ def build_export_filename(beam_label: str | None, draw_format: str) -> str:
 def generate_export_for_design(
     design: models.Design,
     request: DrawingExportRequest,
+    *,
+    read_inline_preview: bool = True,
 ) -> ExportFileResult:
+    """Genera el plano en disco; ``read_inline_preview=False`` omite cargar el SVG en memoria."""
     logger.info(
         "[Export] Generando plano | design_id=%s format=%s template=%s scale=1:%s",
         design.id,
@@ -72,21 +103,37 @@ def generate_export_for_design(
         request.scale,
     )
     payload = design_service.build_beam_drawing_payload(design)
-    document = _render_document(payload, request)
     destination_dir = prepare_destination_dir(payload.metadata.project_name)
     filename = build_export_filename(payload.metadata.beam_label, request.format)
-    file_path = _save_document_to_disk(document, request, destination_dir, filename)
+    cache_key = _export_cache_key(payload, request)
+    extension = _format_extension(request.format)
+    artifact_name = f"{cache_key}.{extension}"
+    # El documento solo se renderiza si algún artefacto no está en caché
+    document: DrawingDocument | None = None
+
+    file_path = _restore_cached(artifact_name, destination_dir / filename)
+    if file_path is None:
+        document = _render_document(payload, request)
+        file_path = _save_document_to_disk(document, request, destination_dir, filename)
+        # Si el exportador entregó otro formato (p. ej. DXF sin conversor DWG) no se cachea
+        if file_path.suffix == f".{extension}":
+            _store_cached(file_path, artifact_name)
     preview_path: Path | None = None
     inline_preview: str | None = None
 
     if request.include_preview:
         if request.format == "svg":
             preview_path = file_path
-            inline_preview = _safe_read(preview_path)
+            if read_inline_preview:
+                inline_preview = _safe_read(preview_path)
         else:
             preview_name = Path(filename).with_suffix(".svg").name
             preview_path = destination_dir / preview_name
-            preview_path.write_text(render_svg(document), encoding="utf-8")
+            if _restore_cached(f"{cache_key}.preview.svg", preview_path) is None:
+                if document is None:
+                    document = _render_document(payload, request)
+                _write_svg(preview_path, render_svg(document))
+                _store_cached(preview_path, f"{cache_key}.preview.svg")
 
     logger.info(
         "[Export] Plano generado | design_id=%s format=%s path=%s",
@@ -125,7 +172,6 @@ def create_export_job(
     )
     db.add(job)
     db.commit()
-    db.refresh(job)
     logger.info("[Export] Job encolado | job_id=%s status=%s", job.job_id, job.status)
     return job
 
@@ -161,26 +207,133 @@ def serialize_export_job(job: models.DesignExport) -> dict:
     }
 
 
-def process_export_job(job_id: str) -> None:
+def submit_export_job(db: Session, job: models.DesignExport) -> Future | None:
+    """Ejecuta el job en un proceso del pool: el render no compite por el GIL con la API."""
+    global _executor
+    job_id = str(job.job_id)
+    with _executor_lock:
+        try:
+            try:
+                future = _get_executor().submit(process_export_job, job_id)
+            except BrokenProcessPool:
+                # Un trabajador murió y el pool quedó inutilizable: se reemplaza y se reintenta una vez.
+                # Sin cancel_futures: los jobs pendientes del pool roto ya fallaron con
+                # BrokenProcessPool y _handle_worker_result los registra por su cuenta
+                logger.warning("Pool de exportación roto; se crea uno nuevo para el job %s", job_id)
+                _executor.shutdown(wait=False)
+                _executor = None
+                future = _get_executor().submit(process_export_job, job_id)
+        except (BrokenProcessPool, RuntimeError) as exc:  # RuntimeError: pool cerrado en el apagado
+            logger.error("No se pudo encolar el job de exportación %s: %r", job_id, exc)
+            future = None
+
+    if future is None:
+        job.status = "failed"
+        job.message = "No se pudo iniciar la exportación"
+        job.updated_at = datetime.now(timezone.utc)
+        db.commit()
+        return None
+
+    future.add_done_callback(lambda done: _handle_worker_result(job_id, done))
+    return future
+
+
+def shutdown_export_executor() -> None:
+    """Cierra el pool al apagar la API; los jobs aún en cola se marcan como fallidos."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # Llamar con _executor_lock tomado
+    global _executor
+    if _executor is None:
+        # "spawn": cada trabajador crea su propio engine en vez de heredar conexiones abiertas
+        _executor = ProcessPoolExecutor(
+            max_workers=_EXPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def _handle_worker_result(job_id: str, future: Future) -> None:
+    # process_export_job captura sus errores; aquí solo llegan la cancelación y la caída del trabajador
+    if future.cancelled():
+        _mark_jobs_failed((job_id,), "Exportación cancelada por el apagado del servidor")
+        return
+    exc = future.exception()
+    if isinstance(exc, BrokenProcessPool):
+        # Puede no ser este job el que tumbó al trabajador: se pide reintentar
+        logger.error("El pool de exportación se rompió con el job %s pendiente: %r", job_id, exc)
+        _mark_jobs_failed((job_id,), "Se interrumpió el proceso de exportación; vuelva a solicitarla")
+    elif exc is not None:
+        logger.error("El proceso de exportación del job %s terminó con error: %r", job_id, exc)
+        _mark_jobs_failed((job_id,), "El proceso de exportación terminó inesperadamente")
+
+
+def _mark_jobs_failed(job_ids: Sequence[str], message: str) -> None:
     db = SessionLocal()
-    job: Optional[models.DesignExport] = None
     try:
-        job = (
-            db.query(models.DesignExport)
-            .options(selectinload(models.DesignExport.design).selectinload(models.Design.beam_despiece))
-            .filter(models.DesignExport.job_id == job_id)
-            .first()
+        db.execute(
+            update(models.DesignExport)
+            .where(models.DesignExport.job_id.in_(job_ids))
+            .values(status="failed", message=message, updated_at=datetime.now(timezone.utc))
         )
-        if job is None:
-            logger.warning("No se encontró el job de exportación %s", job_id)
+        db.commit()
+    except Exception:  # pragma: no cover - fallbacks de runtime
+        logger.exception("No se pudo marcar como fallidos los jobs %s", ", ".join(job_ids))
+        db.rollback()
+    finally:
+        db.close()
+
+
+def process_export_job(job_id: str) -> None:
+    process_export_jobs_batch((job_id,))
+
+
+def process_export_jobs_batch(job_ids: Sequence[str]) -> None:
+    """Procesa varios jobs con una sola sesión y una única carga para todo el lote."""
+    if not job_ids:
+        return
+    db = SessionLocal()
+    try:
+        try:
+            jobs = (
+                db.query(models.DesignExport)
+                .options(selectinload(models.DesignExport.design).selectinload(models.Design.beam_despiece))
+                .filter(models.DesignExport.job_id.in_(job_ids))
+                .all()
+            )
+        except Exception:  # pragma: no cover - fallbacks de runtime
+            logger.exception("Falló la carga de los jobs de exportación %s", ", ".join(job_ids))
+            db.rollback()
+            _mark_jobs_failed(job_ids, "No se pudieron cargar los datos de la exportación")
             return
 
+        # Se procesan en el orden solicitado
+        jobs_by_id = {job.job_id: job for job in jobs}
+        for job_id in job_ids:
+            job = jobs_by_id.get(job_id)
+            if job is None:
+                logger.warning("No se encontró el job de exportación %s", job_id)
+                continue
+            _run_export_job(db, job)
+    finally:
+        db.close()
+
+
+def _run_export_job(db: Session, job: models.DesignExport) -> None:
+    job_id = job.job_id
+    logger.info("[Export] Job en ejecución | job_id=%s", job_id)
+    try:
+        # Se marca justo antes de renderizar: los jobs del lote que esperan siguen "queued"
         job.status = "processing"
         job.message = None
         job.updated_at = datetime.now(timezone.utc)
         db.commit()
-        db.refresh(job)
-        logger.info("[Export] Job en ejecución | job_id=%s", job.job_id)
 
         design = job.design
         if design is None:
@@ -194,29 +347,88 @@ def process_export_job(job_id: str) -> None:
             locale=job.locale,
             include_preview=job.include_preview,
         )
-        result = generate_export_for_design(design, request)
+        # El job solo persiste rutas: la vista previa en línea no se usa
+        result = generate_export_for_design(design, request, read_inline_preview=False)
         job.file_path = str(result.file_path)
         job.preview_path = str(result.preview_path) if result.preview_path else None
         job.status = "completed"
         job.updated_at = datetime.now(timezone.utc)
         db.commit()
-        logger.info("[Export] Job completado | job_id=%s output=%s", job.job_id, job.file_path)
+        logger.info("[Export] Job completado | job_id=%s output=%s", job_id, job.file_path)
     except Exception as exc:  # pragma: no cover - fallbacks de runtime
         logger.exception("Falló el job de exportación %s", job_id)
         db.rollback()
-        if job is not None:
-            job.status = "failed"
-            job.message = str(exc)
-            job.updated_at = datetime.now(timezone.utc)
-            db.add(job)
-            db.commit()
-    finally:
-        db.close()
+        job.status = "failed"
+        job.message = str(exc)
+        job.updated_at = datetime.now(timezone.utc)
+        db.add(job)
+        db.commit()
 
 
 def _render_document(payload: BeamDrawingPayload, request: DrawingExportRequest) -> DrawingDocument:
-    service = BeamDrawingService(template_key=request.template)
-    return service.render_document(payload, export_request=request)
+    return _drawing_service(request.template).render_document(payload, export_request=request)
+
+
+@lru_cache(maxsize=8)
+def _drawing_service(template_key: str) -> BeamDrawingService:
+    # Los renderizadores solo guardan configuración: una instancia por plantilla se comparte entre jobs
+    return BeamDrawingService(template_key=template_key)
+
+
+def _export_cache_key(payload: BeamDrawingPayload, request: DrawingExportRequest) -> str:
+    """Huella del contenido del plano: payload y parámetros de render, sin el diseño ni la vista previa."""
+    digest = hashlib.sha256(_CACHE_VERSION.encode("utf-8"))
+    digest.update(payload.model_dump_json(by_alias=True).encode("utf-8"))
+    digest.update(request.model_dump_json(exclude={"design_id", "include_preview"}).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _restore_cached(cache_name: str, target_path: Path) -> Path | None:
+    cached = _CACHE_DIR / cache_name
+    try:
+        shutil.copyfile(cached, target_path)
+    except OSError:
+        return None
+    # La antigüedad se cuenta desde el último uso
+    try:
+        os.utime(cached)
+    except OSError:
+        pass
+    logger.info("[Export] Artefacto reutilizado de caché | path=%s", target_path)
+    return target_path
+
+
+def _store_cached(source_path: Path, cache_name: str) -> None:
+    # Copia temporal y reemplazo atómico: un lector concurrente nunca ve un archivo a medias
+    partial = _CACHE_DIR / f"{cache_name}.{uuid.uuid4().hex}.tmp"
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(source_path, partial)
+        partial.replace(_CACHE_DIR / cache_name)
+    except OSError:
+        partial.unlink(missing_ok=True)
+        logger.warning("No se pudo guardar en caché el artefacto %s", source_path, exc_info=True)
+    _prune_cache()
+
+
+def _prune_cache() -> None:
+    """Elimina entradas de caché sin uso en _RETENTION_DAYS; como mucho una vez por hora."""
+    global _last_cache_prune
+    now = time.monotonic()
+    if now - _last_cache_prune < _CACHE_PRUNE_INTERVAL_S:
+        return
+    _last_cache_prune = now
+    cutoff = time.time() - _RETENTION_DAYS * 86400
+    try:
+        entries = list(os.scandir(_CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            continue
 
 
 def _save_document_to_disk(
@@ -236,8 +448,7 @@ def _save_document_to_disk(
 
     if request.format == "svg":
         target_path = destination_dir / filename
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        target_path.write_text(render_svg(document), encoding="utf-8")
+        _write_svg(target_path, render_svg(document))
         return target_path
 
     raise RuntimeError(f"Formato no soportado: {request.format}")
@@ -252,13 +463,7 @@ def _path_to_url(path_str: str | None, job_id: str | None = None) -> str | None:
 
 
 def _format_extension(draw_format: str) -> str:
-    mapping = {
-        "dwg": "dwg",
-        "dxf": "dxf",
-        "pdf": "pdf",
-        "svg": "svg",
-    }
-    return mapping.get(draw_format, "dwg")
+    return _FORMAT_EXTENSIONS.get(draw_format, "dwg")
 
 
 def _slugify(value: str) -> str:
@@ -267,6 +472,11 @@ def _slugify(value: str) -> str:
     return cleaned or "archivo"
 
 
+def _write_svg(path: Path, svg: str) -> None:
+    # Escritura binaria directa: sin la capa TextIOWrapper de write_text
+    path.write_bytes(svg.encode("utf-8"))
+
+
 def _safe_read(path: Path) -> str | None:
     try:
         return path.read_text(encoding="utf-8")
@@ -284,5 +494,8 @@ __all__ = [
     "get_job_for_user",
     "prepare_destination_dir",
     "process_export_job",
+    "process_export_jobs_batch",
     "serialize_export_job",
+    "shutdown_export_executor",
+    "submit_export_job",
 ]
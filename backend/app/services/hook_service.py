@@ -1,11 +1,23 @@
+from typing import Sequence
+
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 from app import models
+from app.services.reference_cache import cached_by_mark
+
+# Filas ligeras (tuplas con acceso por atributo) en lugar de entidades ORM
+_HOOK_COLUMNS = select(*models.HookLength.__table__.c)
+
+# Tabla de referencia de solo lectura (la siembran las migraciones): caché por proceso
+_HOOKS_BY_MARK: dict[str, Row] = {}
 
 
-def list_hook_lengths(db: Session) -> list[models.HookLength]:
-    return db.query(models.HookLength).order_by(models.HookLength.id).all()
+def list_hook_lengths(db: Session) -> Sequence[Row]:
+    rows = db.execute(_HOOK_COLUMNS.order_by(models.HookLength.id)).all()
+    _HOOKS_BY_MARK.update((row.bar_mark, row) for row in rows)
+    return rows
 
 
-def get_hook_length_by_mark(db: Session, *, bar_mark: str) -> models.HookLength | None:
-    return db.query(models.HookLength).filter(models.HookLength.bar_mark == bar_mark).first()
+def get_hook_length_by_mark(db: Session, *, bar_mark: str) -> Row | None:
+    return cached_by_mark(db, _HOOKS_BY_MARK, _HOOK_COLUMNS, models.HookLength, bar_mark)
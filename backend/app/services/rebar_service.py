@@ -1,19 +1,36 @@
+from typing import Sequence
+
+from sqlalchemy import Row, select
 from sqlalchemy.orm import Session
 
 from app import models
+from app.services.reference_cache import cached_by_mark
+
+# Filas ligeras (tuplas con acceso por atributo) en lugar de entidades ORM
+_DEVELOPMENT_COLUMNS = select(*models.DevelopmentLength.__table__.c)
+_LAP_SPLICE_COLUMNS = select(*models.LapSpliceLength.__table__.c)
+
+# Tablas de referencia de solo lectura (las siembran las migraciones): caché por proceso
+_DEVELOPMENT_BY_MARK: dict[str, Row] = {}
+_LAP_SPLICE_BY_MARK: dict[str, Row] = {}
+
 
+def list_development_lengths(db: Session) -> Sequence[Row]:
+    rows = db.execute(_DEVELOPMENT_COLUMNS.order_by(models.DevelopmentLength.id)).all()
+    _DEVELOPMENT_BY_MARK.update((row.bar_mark, row) for row in rows)
+    return rows
 
-def list_development_lengths(db: Session) -> list[models.DevelopmentLength]:
-    return db.query(models.DevelopmentLength).order_by(models.DevelopmentLength.id).all()
 
+def list_lap_splice_lengths(db: Session) -> Sequence[Row]:
+    rows = db.execute(_LAP_SPLICE_COLUMNS.order_by(models.LapSpliceLength.id)).all()
+    _LAP_SPLICE_BY_MARK.update((row.bar_mark, row) for row in rows)
+    return rows
 
-def list_lap_splice_lengths(db: Session) -> list[models.LapSpliceLength]:
-    return db.query(models.LapSpliceLength).order_by(models.LapSpliceLength.id).all()
 
+def get_development_length_by_mark(db: Session, *, bar_mark: str) -> Row | None:
+    return cached_by_mark(db, _DEVELOPMENT_BY_MARK, _DEVELOPMENT_COLUMNS, models.DevelopmentLength, bar_mark)
 
-def get_development_length_by_mark(db: Session, *, bar_mark: str) -> models.DevelopmentLength | None:
-    return db.query(models.DevelopmentLength).filter(models.DevelopmentLength.bar_mark == bar_mark).first()
 
+def get_lap_splice_length_by_mark(db: Session, *, bar_mark: str) -> Row | None:
+    return cached_by_mark(db, _LAP_SPLICE_BY_MARK, _LAP_SPLICE_COLUMNS, models.LapSpliceLength, bar_mark)
 
-def get_lap_splice_length_by_mark(db: Session, *, bar_mark: str) -> models.LapSpliceLength | None:
-    return db.query(models.LapSpliceLength).filter(models.LapSpliceLength.bar_mark == bar_mark).first()
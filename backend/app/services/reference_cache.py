@@ -0,0 +1,12 @@
+from sqlalchemy import Row, Select
+from sqlalchemy.orm import Session
+
+
+def cached_by_mark(db: Session, cache: dict[str, Row], columns: Select, model, bar_mark: str) -> Row | None:
+    """Fila de una tabla de referencia por ``bar_mark``; consulta la base solo si no está en ``cache``."""
+    row = cache.get(bar_mark)
+    if row is None:
+        row = db.execute(columns.where(model.bar_mark == bar_mark)).first()
+        if row is not None:
+            cache[bar_mark] = row
+    return row
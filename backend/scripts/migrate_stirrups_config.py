@@ -3,6 +3,7 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
@@ -13,48 +14,46 @@ from app import models  # noqa: E402
 from app.database import SessionLocal  # noqa: E402
 from app.schemas.design import StirrupConfig  # noqa: E402
 
+_BATCH_SIZE = 500
+_STIRRUP_LIST_ADAPTER = TypeAdapter(list[StirrupConfig])
+
 
 def convert_stirrups_payload(stirrups_payload: list[dict]) -> tuple[list[dict], bool]:
     """Normaliza cada configuración según StirrupConfig."""
-    converted: list[dict] = []
-    changed = False
-
-    for entry in stirrups_payload:
-        validated = StirrupConfig.model_validate(entry)
-        converted_entry = validated.model_dump()
-        converted.append(converted_entry)
-        if entry != converted_entry:
-            changed = True
-
-    return converted, changed
+    # Validación y volcado de la lista completa en pydantic-core, sin bucle por entrada
+    converted: list[dict] = _STIRRUP_LIST_ADAPTER.dump_python(
+        _STIRRUP_LIST_ADAPTER.validate_python(stirrups_payload)
+    )
+    return converted, stirrups_payload != converted
 
 
 def migrate() -> None:
     session: Session = SessionLocal()
-    updated_records = 0
+    updates: list[dict] = []
 
     try:
-        records = session.query(models.DespieceViga).all()
-        for record in records:
-            payload = record.stirrups_config or []
+        # Solo id y configuración, leídos por lotes: sin cargar entidades completas
+        rows = session.query(models.DespieceViga.id, models.DespieceViga.stirrups_config).yield_per(_BATCH_SIZE)
+        for record_id, payload in rows:
             if not payload:
                 continue
 
             converted, changed = convert_stirrups_payload(payload)
-            if not changed:
-                continue
+            if changed:
+                updates.append({"id": record_id, "stirrups_config": converted})
 
-            record.stirrups_config = converted
-            updated_records += 1
+        # UPDATE por lotes (executemany) en una sola transacción
+        for start in range(0, len(updates), _BATCH_SIZE):
+            session.bulk_update_mappings(models.DespieceViga, updates[start : start + _BATCH_SIZE])
 
-        if updated_records:
+        if updates:
             session.commit()
         else:
             session.rollback()
     finally:
         session.close()
 
-    print(f"Registros actualizados: {updated_records}")
+    print(f"Registros actualizados: {len(updates)}")
 
 
 if __name__ == "__main__":
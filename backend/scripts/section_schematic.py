@@ -85,32 +85,38 @@ def _extract_parameters() -> SectionParameters:
     return params
 
 
+def _fmt(value: float) -> str:
+    """Coordenada con 3 decimales sin ceros finales ("0.300" -> "0.3")."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
 def _svg_rect(x, y, width, height, stroke="black", stroke_width=2, dash: str | None = None, fill="none") -> str:
     dash_attr = f' stroke-dasharray="{dash}"' if dash else ""
     return (
-        f'<rect x="{x:.3f}" y="{-y - height:.3f}" width="{width:.3f}" height="{height:.3f}" '
+        f'<rect x="{_fmt(x)}" y="{_fmt(-y - height)}" width="{_fmt(width)}" height="{_fmt(height)}" '
         f'fill="{fill}" stroke="{stroke}" stroke-width="{stroke_width}"{dash_attr}/>'
     )
 
 
 def _svg_circle(cx, cy, r) -> str:
-    return f'<circle cx="{cx:.3f}" cy="{-cy:.3f}" r="{r:.3f}" fill="none" stroke="black" stroke-width="1.5" />'
+    return f'<circle cx="{_fmt(cx)}" cy="{_fmt(-cy)}" r="{_fmt(r)}" fill="none" stroke="black" stroke-width="1.5" />'
 
 
 def _svg_polyline(points, stroke_width=2, stroke="black", fill="none") -> str:
-    coords = " ".join(f"{x:.3f},{-y:.3f}" for (x, y) in points)
+    coords = " ".join(f"{_fmt(x)},{_fmt(-y)}" for (x, y) in points)
     return f'<polyline points="{coords}" fill="{fill}" stroke="{stroke}" stroke-width="{stroke_width}" />'
 
 
 def _svg_line(x1, y1, x2, y2, stroke_width=2, stroke="black") -> str:
-    return f'<line x1="{x1:.3f}" y1="{-y1:.3f}" x2="{x2:.3f}" y2="{-y2:.3f}" stroke="{stroke}" stroke-width="{stroke_width}" />'
+    return f'<line x1="{_fmt(x1)}" y1="{_fmt(-y1)}" x2="{_fmt(x2)}" y2="{_fmt(-y2)}" stroke="{stroke}" stroke-width="{stroke_width}" />'
 
 
 def _svg_text(x, y, text, size=12, anchor="middle", rotation=None, weight="normal") -> str:
-    rotate_attr = f' transform="rotate({rotation},{x:.3f},{-y:.3f})"' if rotation else ""
+    rotate_attr = f' transform="rotate({rotation},{_fmt(x)},{_fmt(-y)})"' if rotation else ""
     weight_attr = f' font-weight="{weight}"' if weight != "normal" else ""
     return (
-        f'<text x="{x:.3f}" y="{-y:.3f}" font-size="{size}" '
+        f'<text x="{_fmt(x)}" y="{_fmt(-y)}" font-size="{size}" '
         f'text-anchor="{anchor}" dominant-baseline="middle"{rotate_attr}{weight_attr}>{text}</text>'
     )
 
@@ -118,7 +124,7 @@ def _svg_text(x, y, text, size=12, anchor="middle", rotation=None, weight="norma
 def _svg_arrow(x1, y1, x2, y2, text="", size=10):
     """Dibuja una línea con flecha y texto"""
     # Línea principal
-    line = f'<line x1="{x1:.3f}" y1="{-y1:.3f}" x2="{x2:.3f}" y2="{-y2:.3f}" stroke="black" stroke-width="1.5"/>'
+    line = f'<line x1="{_fmt(x1)}" y1="{_fmt(-y1)}" x2="{_fmt(x2)}" y2="{_fmt(-y2)}" stroke="black" stroke-width="1.5"/>'
     
     # Flecha (triángulo simple)
     dx = x2 - x1
@@ -133,7 +139,7 @@ def _svg_arrow(x1, y1, x2, y2, text="", size=10):
             (x2 - arrow_size * ux - arrow_size * 0.5 * uy, y2 - arrow_size * uy + arrow_size * 0.5 * ux),
             (x2 - arrow_size * ux + arrow_size * 0.5 * uy, y2 - arrow_size * uy - arrow_size * 0.5 * ux)
         ]
-        arrow_coords = " ".join(f"{p[0]:.3f},{-p[1]:.3f}" for p in arrow_points)
+        arrow_coords = " ".join(f"{_fmt(p[0])},{_fmt(-p[1])}" for p in arrow_points)
         arrow = f'<polygon points="{arrow_coords}" fill="black"/>'
     else:
         arrow = ""